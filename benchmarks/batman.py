@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Measures how the time needed to parse alfred-vis data
+scales with the number of nodes, usage::
+
+    python benchmarks/batman.py [max_nodes]
+"""
+import random
+import sys
+import timeit
+
+from netdiff import BatmanParser
+
+
+def mac_address(node, interface):
+    return "02:00:{0:02x}:{1:02x}:{2:02x}:{3:02x}".format(
+        interface, node >> 16 & 255, node >> 8 & 255, node & 255
+    )
+
+
+def generate_vis(nodes, neighbors=4, secondary=2, seed=1):
+    """
+    Returns alfred-vis data of a mesh in which each node has ``secondary``
+    interfaces besides the primary one and about ``neighbors`` neighbors,
+    reached through random interfaces
+    """
+    rng = random.Random(seed)
+    vis = []
+    for node in range(nodes):
+        neighbor_list = []
+        for neighbor in rng.sample(range(nodes), min(neighbors, nodes)):
+            if neighbor == node:
+                continue
+            neighbor_list.append(
+                {
+                    "router": mac_address(node, 0),
+                    "neighbor": mac_address(neighbor, rng.randint(0, secondary)),
+                    "metric": "{0:.3f}".format(rng.uniform(1, 5)),
+                }
+            )
+        vis.append(
+            {
+                "primary": mac_address(node, 0),
+                "secondary": [mac_address(node, i) for i in range(1, secondary + 1)],
+                "neighbors": neighbor_list,
+                "clients": [],
+            }
+        )
+    return {"source_version": "2015.0", "algorithm": 4, "vis": vis}
+
+
+def main(max_nodes=4000):
+    print("{0:>8} {1:>8} {2:>10}".format("nodes", "links", "seconds"))
+    nodes = 250
+    while nodes <= max_nodes:
+        data = generate_vis(nodes)
+        parser = BatmanParser(data)
+        seconds = min(timeit.repeat(lambda: BatmanParser(data), number=1, repeat=3))
+        print(
+            "{0:>8} {1:>8} {2:>10.4f}".format(
+                nodes, parser.graph.number_of_edges(), seconds
+            )
+        )
+        nodes *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Compares networkx graphs and ``CompactGraph``: memory retained by the
+graph of a parsed OLSR topology, parse time and diff time, usage::
+
+    python benchmarks/compact_graph.py [nodes]
+"""
+import sys
+import time
+import tracemalloc
+
+from olsr import generate_txtinfo
+
+from netdiff import OlsrParser, diff
+
+
+def measure(data, compact):
+    tracemalloc.start()
+    start = time.perf_counter()
+    parser = OlsrParser(data, compact=compact)
+    seconds = time.perf_counter() - start
+    # the raw data is not part of the graph
+    parser.original_data = None
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return parser, seconds, size
+
+
+def main(nodes=20000):
+    old_data = generate_txtinfo(nodes, seed=1)
+    new_data = generate_txtinfo(nodes, seed=2)
+    print(
+        "{0:>10} {1:>10} {2:>12} {3:>10}".format("graph", "parse", "bytes/link", "diff")
+    )
+    for name, compact in [("networkx", False), ("compact", True)]:
+        old, seconds, size = measure(old_data, compact)
+        new = OlsrParser(new_data, compact=compact)
+        start = time.perf_counter()
+        diff(old, new)
+        diff_seconds = time.perf_counter() - start
+        links = old.graph.number_of_edges()
+        print(
+            "{0:>10} {1:>10.3f} {2:>12.0f} {3:>10.3f}".format(
+                name, seconds, size / float(links), diff_seconds
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Measures how ``netdiff.diff`` scales with the size of the topology.
+
+The time taken by each run should roughly double together
+with the number of nodes and links, usage::
+
+    python benchmarks/diff.py [max_nodes]
+"""
+import random
+import sys
+import timeit
+
+from netdiff import NetJsonParser, diff
+
+
+def generate_topology(nodes, seed=1, changes=0.05):
+    """
+    returns a NetJSON NetworkGraph dict with the amount of nodes specified
+    and twice as many links, a fraction of the links (``changes``)
+    gets a random cost which depends on ``seed``
+    """
+    rand = random.Random(seed)
+    node_list = [
+        {
+            "id": "10.{0}.{1}.1".format(i // 256, i % 256),
+            "label": "node-{0}".format(i),
+            "local_addresses": ["172.16.{0}.{1}".format(i // 256, i % 256)],
+            "properties": {"hostname": "node-{0}.mesh".format(i)},
+        }
+        for i in range(nodes)
+    ]
+    link_list = []
+    for i in range(nodes):
+        for offset in (1, 7):
+            cost = 1.0
+            if rand.random() < changes:
+                cost = rand.choice([1.5, 2.0, 3.0])
+            link_list.append(
+                {
+                    "source": node_list[i]["id"],
+                    "target": node_list[(i + offset) % nodes]["id"],
+                    "cost": cost,
+                    "properties": {"link_quality": 1.0},
+                }
+            )
+    return {
+        "type": "NetworkGraph",
+        "protocol": "OLSR",
+        "version": "0.8",
+        "metric": "ETX",
+        "nodes": node_list,
+        "links": link_list,
+    }
+
+
+def main(max_nodes=8000):
+    nodes = 1000
+    previous = None
+    print("{0:>8} {1:>8} {2:>10} {3:>7}".format("nodes", "links", "seconds", "ratio"))
+    while nodes <= max_nodes:
+        old = NetJsonParser(generate_topology(nodes, seed=1))
+        new = NetJsonParser(generate_topology(nodes, seed=2))
+        seconds = min(timeit.repeat(lambda: diff(old, new), number=1, repeat=3))
+        ratio = seconds / previous if previous else 1.0
+        print(
+            "{0:>8} {1:>8} {2:>10.4f} {3:>7.2f}".format(
+                nodes, new.graph.number_of_edges(), seconds, ratio
+            )
+        )
+        previous = seconds
+        nodes *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+"""
+Compares the time taken to diff a series of snapshots pairwise with
+``diff()`` and with ``diff_series()``, usage::
+
+    python benchmarks/diff_series.py [nodes] [snapshots] [processes]
+"""
+import sys
+import time
+
+from diff import generate_topology
+
+from netdiff import NetJsonParser, diff, diff_series
+
+
+def measure(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(nodes=2000, snapshots=100, processes=4):
+    parsers = [
+        NetJsonParser(generate_topology(nodes, seed=seed, changes=0.01))
+        for seed in range(snapshots)
+    ]
+    pairwise = measure(
+        lambda: [diff(old, new) for old, new in zip(parsers, parsers[1:])]
+    )
+    series = measure(lambda: list(diff_series(parsers)))
+    parallel = measure(lambda: list(diff_series(parsers, processes=processes)))
+    print("pairwise diff():            {0:.2f} s".format(pairwise))
+    print("diff_series():              {0:.2f} s".format(series))
+    print("diff_series(processes={0}):  {1:.2f} s".format(processes, parallel))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
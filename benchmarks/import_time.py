@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+"""
+Measures the time needed to import netdiff in a new interpreter
+and which third party dependencies get imported, usage::
+
+    python benchmarks/import_time.py [repeat]
+"""
+import subprocess
+import sys
+import timeit
+
+STATEMENTS = [
+    "pass",
+    "import netdiff",
+    "from netdiff import diff",
+    "from netdiff import NetJsonParser",
+    'from netdiff import OlsrParser; OlsrParser(data=\'{"topology": [], "mid": []}\')',
+    "from netdiff import OpenvpnParser",
+    "from netdiff import CnmlParser",
+]
+DEPENDENCIES = [
+    "networkx",
+    "requests",
+    "Exscript",
+    "libcnml",
+    "openvpn_status",
+    "asyncio",
+]
+REPORT = "import sys; print(','.join(m for m in {0!r} if m in sys.modules))".format(
+    DEPENDENCIES
+)
+
+
+def run(statement):
+    return subprocess.check_output([sys.executable, "-c", statement]).decode()
+
+
+def main(repeat=5):
+    print("{0:>10}  {1:<30} {2}".format("ms", "dependencies", "statement"))
+    for statement in STATEMENTS:
+        seconds = min(timeit.repeat(lambda: run(statement), number=1, repeat=repeat))
+        modules = run("{0}\n{1}".format(statement, REPORT)).strip()
+        print("{0:>10.1f}  {1:<30} {2}".format(seconds * 1000, modules, statement))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Measures the memory retained by a history of snapshots of the same
+topology, each one parsed from a new string, with and without
+interning node IDs, usage::
+
+    python benchmarks/interning.py [nodes] [snapshots]
+"""
+import contextlib
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+from olsr import generate_txtinfo
+
+from netdiff import OlsrParser, diff
+
+
+def disable_interning(stack):
+    for module in ["netdiff.graph", "netdiff.parsers.olsr"]:
+        stack.enter_context(mock.patch(module + ".intern", lambda value: value))
+
+
+def measure(nodes, snapshots, compact):
+    tracemalloc.start()
+    parsers = []
+    for snapshot in range(snapshots):
+        # two alternating topologies, so that diff() finds changes
+        data = generate_txtinfo(nodes, seed=snapshot % 2)
+        parser = OlsrParser(data, compact=compact)
+        # only the graphs are kept
+        parser.original_data = None
+        parsers.append(parser)
+        del data
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    seconds = []
+    for old, new in zip(parsers, parsers[1:]):
+        start = time.perf_counter()
+        diff(old, new)
+        seconds.append(time.perf_counter() - start)
+    return size / 1024.0 / 1024.0, min(seconds)
+
+
+def main(nodes=5000, snapshots=20):
+    print("{0:>10} {1:>10} {2:>10} {3:>10}".format("graph", "interning", "MB", "diff"))
+    for compact in [False, True]:
+        for interning in [False, True]:
+            with contextlib.ExitStack() as stack:
+                if not interning:
+                    disable_interning(stack)
+                results = measure(nodes, snapshots, compact)
+            print(
+                "{0:>10} {1:>10} {2:>10.1f} {3:>10.4f}".format(
+                    "compact" if compact else "networkx", str(interning), *results
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
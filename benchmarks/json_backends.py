@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Compares the JSON backends which are installed by decoding and encoding
+a synthetic NetJSON NetworkGraph, usage::
+
+    python benchmarks/json_backends.py [nodes]
+"""
+import sys
+import timeit
+
+from diff import generate_topology
+
+from netdiff import NetJsonParser, json_backend, set_json_backend
+
+
+def main(nodes=20000):
+    data = NetJsonParser(generate_topology(nodes)).json()
+    print("payload: {0:.1f} MB".format(len(data) / 1024.0 / 1024.0))
+    print(
+        "{0:>10} {1:>10} {2:>10} {3:>10}".format("backend", "loads", "dumps", "parse")
+    )
+    for name in json_backend.BACKENDS:
+        try:
+            set_json_backend(name)
+        except ImportError:
+            print("{0:>10} {1:>10}".format(name, "missing"))
+            continue
+        parser = NetJsonParser(data)
+        results = [
+            min(timeit.repeat(function, number=1, repeat=3))
+            for function in [
+                lambda: json_backend.loads(data),
+                lambda: parser.json(),
+                lambda: NetJsonParser(data),
+            ]
+        ]
+        print("{0:>10} {1:>10.4f} {2:>10.4f} {3:>10.4f}".format(name, *results))
+    set_json_backend(None)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+"""
+Compares time and peak memory of parsing a synthetic NetJSON
+NetworkGraph from a string and from a file object, usage::
+
+    python benchmarks/netjson_stream.py [nodes]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from diff import generate_topology
+
+from netdiff import NetJsonParser
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024.0 / 1024.0
+
+
+def parse_stream(path):
+    with open(path, "rb") as stream:
+        return NetJsonParser(stream)
+
+
+def main(nodes=20000):
+    data = NetJsonParser(generate_topology(nodes)).json()
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        f.write(data)
+    del data
+    print("payload: {0:.1f} MB".format(os.path.getsize(f.name) / 1024.0 / 1024.0))
+    print("{0:>10} {1:>10} {2:>10}".format("mode", "seconds", "peak MB"))
+    try:
+        for mode, function in [
+            ("file", lambda: NetJsonParser(file=f.name)),
+            ("stream", lambda: parse_stream(f.name)),
+        ]:
+            print("{0:>10} {1:>10.3f} {2:>10.1f}".format(mode, *measure(function)))
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+"""
+Measures time and peak memory of parsing synthetic
+OLSR txtinfo dumps from strings and streams.
+
+Reading txtinfo in a single pass made parsing a 16000 nodes dump
+(2 MB) from a string about 1.5x faster (0.38s to 0.25s, measured
+without tracemalloc) and reduced the peak memory from 36 MB to 20 MB,
+usage::
+
+    python benchmarks/olsr.py [max_nodes]
+"""
+import io
+import random
+import sys
+import time
+import tracemalloc
+
+from netdiff import OlsrParser
+
+HEADER = "Table: Topology\nDest. IP\tLast hop IP\tLQ\tNLQ\tCost\n"
+FOOTER = "\nTable: HNA\nDestination\tGateway\n\nTable: MID\nIP address\tAliases\n"
+
+
+def ip_address(node):
+    return "10.{0}.{1}.{2}".format(node >> 16 & 255, node >> 8 & 255, node & 255)
+
+
+def generate_txtinfo(nodes, links=3, aliases=0.2, seed=1):
+    """
+    Returns a txtinfo dump with about ``links`` links per node,
+    a fraction ``aliases`` of the nodes has two aliases
+    """
+    rng = random.Random(seed)
+    rows = []
+    for node in range(nodes):
+        for neighbor in rng.sample(range(nodes), min(links, nodes)):
+            if neighbor == node:
+                continue
+            rows.append(
+                "{0}\t{1}\t{2:.3f}\t{3:.3f}\t{4:.3f}\n".format(
+                    ip_address(neighbor),
+                    ip_address(node),
+                    rng.random(),
+                    rng.random(),
+                    rng.uniform(1, 30),
+                )
+            )
+    mid = [
+        "{0}\t172.16.{1}.1;172.17.{1}.1\n".format(ip_address(node), node & 255)
+        for node in rng.sample(range(nodes), int(nodes * aliases))
+    ]
+    return HEADER + "".join(rows) + FOOTER + "".join(mid) + "\n"
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024.0 / 1024.0
+
+
+def main(max_nodes=16000):
+    print(
+        "{0:>8} {1:>8} {2:>12} {3:>12}".format(
+            "nodes", "MB", "string (s/MB)", "stream (s/MB)"
+        )
+    )
+    # imports networkx before measuring
+    OlsrParser(generate_txtinfo(10))
+    nodes = 1000
+    while nodes <= max_nodes:
+        data = generate_txtinfo(nodes)
+        encoded = data.encode()
+        string = measure(lambda: OlsrParser(data))
+        stream = measure(lambda: OlsrParser(io.BytesIO(encoded)))
+        print(
+            "{0:>8} {1:>8.1f} {2:>6.3f}/{3:<5.1f} {4:>6.3f}/{5:<5.1f}".format(
+                nodes, len(encoded) / 1024.0 / 1024.0, *(string + stream)
+            )
+        )
+        nodes *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Measures how the time needed to parse OpenVPN status logs
+scales with the number of clients, usage::
+
+    python benchmarks/openvpn.py [max_clients]
+"""
+import sys
+import timeit
+
+from netdiff import OpenvpnParser
+
+DATE = "Thu Jun 18 04:23:03 2015"
+
+
+def generate_status(clients, duplicates=0.1):
+    """
+    Returns an OpenVPN status log (version 1) in which a fraction
+    ``duplicates`` of the clients share their common name and
+    host address with another client
+    """
+    client_lines = []
+    route_lines = []
+    for client in range(clients):
+        host = "10.{0}.{1}.{2}".format(
+            client >> 16 & 255, client >> 8 & 255, client & 255
+        )
+        common_name = "client{0}".format(client)
+        if client % int(1 / duplicates) == 1:
+            common_name = "client{0}".format(client - 1)
+            host = client_lines[-1].split(",")[1].split(":")[0]
+        real_address = "{0}:{1}".format(host, 1024 + client)
+        client_lines.append(
+            "{0},{1},334948,1973012,{2}".format(common_name, real_address, DATE)
+        )
+        virtual_address = "172.{0}.{1}.{2}".format(
+            16 + (client >> 16 & 15), client >> 8 & 255, client & 255
+        )
+        route_lines.append(
+            "{0},{1},{2},{3}".format(virtual_address, common_name, real_address, DATE)
+        )
+    return "\n".join(
+        ["OpenVPN CLIENT LIST", "Updated,{0}".format(DATE)]
+        + ["Common Name,Real Address,Bytes Received,Bytes Sent,Connected Since"]
+        + client_lines
+        + ["ROUTING TABLE", "Virtual Address,Common Name,Real Address,Last Ref"]
+        + route_lines
+        + ["GLOBAL STATS", "Max bcast/mcast queue length,0", "END", ""]
+    )
+
+
+def main(max_clients=10000):
+    print("{0:>8} {1:>10} {2:>10}".format("clients", "to_python", "parse"))
+    clients = 625
+    while clients <= max_clients:
+        data = generate_status(clients)
+        parser = OpenvpnParser(data, duplicate_cn=True)
+        python = parser.to_python(data)
+        results = [
+            min(timeit.repeat(function, number=1, repeat=3))
+            for function in [
+                lambda: parser.to_python(data),
+                lambda: parser.parse(python),
+            ]
+        ]
+        print("{0:>8} {1:>10.4f} {2:>10.4f}".format(clients, *results))
+        clients *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Compares the size of a ``SnapshotStore`` with the size of
+the full NetJSON output of each snapshot, usage::
+
+    python benchmarks/snapshot_store.py [nodes] [snapshots] [keyframe_interval]
+"""
+import sys
+import time
+
+from diff import generate_topology
+
+from netdiff import NetJsonParser, SnapshotStore
+
+
+def main(nodes=2000, snapshots=200, keyframe_interval=100):
+    store = SnapshotStore(keyframe_interval=keyframe_interval)
+    full_size = 0
+    parsers = []
+    start = time.perf_counter()
+    for snapshot in range(snapshots):
+        # about 1% of the links change cost at each snapshot
+        parser = NetJsonParser(generate_topology(nodes, seed=snapshot, changes=0.01))
+        full_size += len(parser.json())
+        store.add(parser, snapshot)
+        parsers.append(parser)
+    seconds = time.perf_counter() - start
+    page_size, page_count = [
+        store.connection.execute("PRAGMA {0}".format(pragma)).fetchone()[0]
+        for pragma in ("page_size", "page_count")
+    ]
+    print("full NetJSON: {0:.1f} MB".format(full_size / 1024.0 / 1024.0))
+    print("store:        {0:.1f} MB".format(page_size * page_count / 1024.0 / 1024.0))
+    print("add():        {0:.4f} s/snapshot".format(seconds / snapshots))
+    start = time.perf_counter()
+    snapshot = store.get(keyframe_interval - 1)
+    print("get():        {0:.4f} s (worst case)".format(time.perf_counter() - start))
+    assert snapshot == parsers[keyframe_interval - 1].json(dict=True)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Measures the size of the output of ``diff()`` between snapshots of a
+topology whose link costs jitter at every poll, with and without
+tolerances, usage::
+
+    python benchmarks/tolerances.py [nodes] [snapshots]
+"""
+import random
+import sys
+
+from diff import generate_topology
+
+from netdiff import NetJsonParser, diff_series
+from netdiff.json_backend import dumps
+
+
+def jitter(topology, seed):
+    """
+    changes the cost of every link by up to 5%,
+    while 1% of the links double their cost
+    """
+    rand = random.Random(seed)
+    for link in topology["links"]:
+        link["cost"] = link["cost"] * rand.uniform(0.95, 1.05)
+        if rand.random() < 0.01:
+            link["cost"] *= 2
+    return topology
+
+
+def main(nodes=2000, snapshots=20):
+    parsers = [
+        NetJsonParser(jitter(generate_topology(nodes, changes=0), seed))
+        for seed in range(snapshots)
+    ]
+    print("{0:>30} {1:>14} {2:>10}".format("tolerances", "changed links", "KB"))
+    for tolerances in [None, {"cost": {"relative": 0.15}}]:
+        changed = size = 0
+        for result in diff_series(parsers, tolerances=tolerances):
+            if result["changed"]:
+                changed += len(result["changed"]["links"])
+            size += len(dumps(result))
+        print(
+            "{0:>30} {1:>14} {2:>10.1f}".format(
+                str(tolerances), changed // (snapshots - 1), size / 1024.0
+            )
+        )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
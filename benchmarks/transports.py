@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Compares retrieving an OLSR txtinfo dump from the output of a command
+through a temporary file with the ``exec://`` transport, usage::
+
+    python benchmarks/transports.py [nodes]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from olsr import generate_txtinfo
+
+from netdiff import OlsrParser, register_transport
+from netdiff.transports import exec_transport
+
+
+def temporary_file(command):
+    with tempfile.NamedTemporaryFile("wb", delete=False) as f:
+        f.write(subprocess.run(command, stdout=subprocess.PIPE, check=True).stdout)
+    try:
+        return OlsrParser(file=f.name)
+    finally:
+        os.unlink(f.name)
+
+
+def transport(command):
+    return OlsrParser(url="exec://" + " ".join(command))
+
+
+def main(nodes=20000):
+    register_transport("exec", exec_transport)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(generate_txtinfo(nodes))
+    # the command which outputs the topology
+    command = ["cat", f.name]
+    try:
+        for function in [temporary_file, transport]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            function(command)
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                "{0:>16} {1:>8.3f} s {2:>8.1f} MB peak".format(
+                    function.__name__, seconds, peak / 1024.0 / 1024.0
+                )
+            )
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+"""
+Measures how the time needed to parse the output of
+``wg show all dump`` scales with the number of peers, usage::
+
+    python benchmarks/wireguard.py [max_peers]
+"""
+import base64
+import random
+import sys
+import time
+import timeit
+
+from netdiff import WireguardParser
+
+
+def generate_dump(peers, connected=0.5, seed=1):
+    """
+    Returns the output of ``wg show all dump`` for an interface with
+    ``peers`` peers, a fraction ``connected`` of which has handshaked
+    recently, while the others have handshaked long ago or never
+    """
+    rng = random.Random(seed)
+    now = int(time.time())
+
+    def key():
+        return base64.b64encode(rng.randbytes(32)).decode()
+
+    lines = ["wg0\t{0}\t{1}\t51820\toff".format(key(), key())]
+    for peer in range(peers):
+        if rng.random() < connected:
+            handshake = now - rng.randint(0, 120)
+        else:
+            handshake = rng.choice([0, now - 86400 - rng.randint(0, 3600)])
+        lines.append(
+            "wg0\t{0}\t(none)\t192.0.2.{1}:51820\t10.{2}.{3}.{4}/32\t{5}\t{6}\t{7}\toff".format(
+                key(),
+                peer & 255,
+                peer >> 16 & 255,
+                peer >> 8 & 255,
+                peer & 255,
+                handshake,
+                rng.randint(0, 10**9),
+                rng.randint(0, 10**9),
+            )
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(max_peers=40000):
+    print("{0:>8} {1:>10}".format("peers", "seconds"))
+    peers = 2500
+    while peers <= max_peers:
+        data = generate_dump(peers)
+        seconds = min(timeit.repeat(lambda: WireguardParser(data), number=1, repeat=3))
+        print("{0:>8} {1:>10.4f}".format(peers, seconds))
+        peers *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
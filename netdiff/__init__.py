@@ -1,10 +1,56 @@
+import importlib
+
+from .graph import CompactGraph  # noqa
 from .info import VERSION, __version__, get_version  # noqa
-from .parsers.batman import BatmanParser  # noqa
-from .parsers.bmx6 import Bmx6Parser  # noqa
-from .parsers.cnml import CnmlParser  # noqa
-from .parsers.netjson import NetJsonParser  # noqa
-from .parsers.olsr import OlsrParser  # noqa
-from .parsers.openvpn import OpenvpnParser  # noqa
-from .parsers.wireguard import WireguardParser  # noqa
-from .parsers.zerotier import ZeroTierParser  # noqa
-from .utils import diff  # noqa
+from .json_backend import set_json_backend  # noqa
+from .sessions import create_session, set_default_session  # noqa
+from .tracker import TopologyTracker, diff_series  # noqa
+from .transports import register_transport  # noqa
+from .utils import apply_diff, compose_diffs, diff, inverse_diff  # noqa
+
+# parsers and their third party dependencies are imported on first access
+_lazy_attributes = {
+    "BatmanParser": ".parsers.batman",
+    "Bmx6Parser": ".parsers.bmx6",
+    "CnmlParser": ".parsers.cnml",
+    "NetJsonParser": ".parsers.netjson",
+    "OlsrParser": ".parsers.olsr",
+    "OpenvpnParser": ".parsers.openvpn",
+    "WireguardParser": ".parsers.wireguard",
+    "ZeroTierParser": ".parsers.zerotier",
+    "collect": ".collector",
+    "SnapshotStore": ".store",
+}
+
+__all__ = [
+    "VERSION",
+    "__version__",
+    "get_version",
+    "CompactGraph",
+    "set_json_backend",
+    "create_session",
+    "set_default_session",
+    "register_transport",
+    "TopologyTracker",
+    "diff_series",
+    "diff",
+    "apply_diff",
+    "inverse_diff",
+    "compose_diffs",
+] + list(_lazy_attributes)
+
+
+def __getattr__(name):
+    try:
+        module = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError(
+            "module {0!r} has no attribute {1!r}".format(__name__, name)
+        )
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes))
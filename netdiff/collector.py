@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .parsers.base import BaseParser
+
+# arguments used to retrieve the topology data, the others are used for parsing
+RETRIEVAL_ARGUMENTS = ("url", "file", "timeout", "verify", "session")
+
+
+def collect(sources, max_workers=16, processes=None, **kwargs):
+    """
+    Retrieves and parses many topologies concurrently
+
+    :param sources: iterable of ``(parser_class, source)`` tuples, where
+                    ``source`` is either a URL or a ``dict`` of arguments
+                    for the parser (eg: ``{"file": "topology.json"}``)
+    :param max_workers: number of threads which retrieve the topologies
+    :param processes: number of processes used to parse the retrieved data,
+                      by default the data is parsed by the retrieving threads
+    :param kwargs: arguments passed to all the parsers (eg: ``timeout``),
+                   ``source`` has precedence over them
+    :returns: ``list`` containing, in the same order of ``sources``, either
+              the parser or the exception raised for each source
+    """
+    jobs = []
+    for parser_class, source in sources:
+        if isinstance(source, str):
+            source = {"url": source}
+        jobs.append((parser_class, dict(kwargs, **source)))
+    pool = ProcessPoolExecutor(processes) if processes else None
+    try:
+        with ThreadPoolExecutor(max_workers) as threads:
+            futures = [
+                threads.submit(_collect, parser_class, options, pool)
+                for parser_class, options in jobs
+            ]
+            return [future.result() for future in futures]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def _collect(parser_class, options, pool):
+    """
+    returns the parser for a single source or the exception raised
+    """
+    try:
+        if pool is None:
+            return parser_class(**options)
+        retrieval = {}
+        for argument in RETRIEVAL_ARGUMENTS:
+            if argument in options:
+                retrieval[argument] = options.pop(argument)
+        if "data" not in options:
+            options["data"] = _Retriever(**retrieval).original_data
+        return pool.submit(parser_class, **options).result()
+    except Exception as e:
+        return e
+
+
+class _Retriever(BaseParser):
+    """
+    retrieves the raw topology data without converting nor parsing it
+    """
+
+    _cacheable = False
+
+    def to_python(self, data):
+        return data
+
+    def parse(self, data):
+        return None
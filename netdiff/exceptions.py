@@ -16,6 +16,15 @@ class ConversionException(NetdiffException):
 
     def __init__(self, *args, **kwargs):
         self.data = kwargs.pop("data")
+        super().__init__(*args)
+
+    def __reduce__(self):
+        # allows to send the exception across processes
+        return _rebuild_conversion_exception, (self.args, self.data)
+
+
+def _rebuild_conversion_exception(args, data):
+    return ConversionException(*args, data=data)
 
 
 class ParserError(NetdiffException):
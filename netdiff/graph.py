@@ -0,0 +1,247 @@
+import sys
+from array import array
+
+# marks missing values in the columns of attributes
+_MISSING = object()
+
+
+def intern(value):
+    """
+    Returns the interned copy of ``value`` if it is a string, used by
+    parsers for node IDs, so that the IDs repeated in the topologies
+    parsed over time are stored once
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class _Column(object):
+    """
+    Stores the values of one attribute for all the nodes or links,
+    the values are stored in an array of doubles as long as they are
+    all floats (which saves a float object per value), otherwise in a list
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values = array("d")
+
+    def get(self, index):
+        values = self.values
+        if index >= len(values):
+            return _MISSING
+        return values[index]
+
+    def set(self, index, value):
+        values = self.values
+        if type(values) is array and (type(value) is not float or index > len(values)):
+            values = self.values = values.tolist()
+        if index < len(values):
+            values[index] = value
+            return
+        values.extend([_MISSING] * (index - len(values)))
+        values.append(value)
+
+
+class CompactGraph(object):
+    """
+    Memory efficient graph which supports the subset of the
+    ``networkx.Graph`` interface used by netdiff parsers:
+    node IDs are interned and mapped to integers, links are stored
+    in arrays of integers and attributes are stored by column, one
+    ``_Column`` per attribute for all nodes and one for all links.
+
+    Nodes and links can't be removed; ``to_networkx()`` returns
+    an equivalent ``networkx`` graph, which can be used to run
+    graph algorithms.
+    """
+
+    def __init__(self, directed=False):
+        self.directed = directed
+        # node IDs by index and index of each node ID
+        self._ids = []
+        self._index = {}
+        self._node_columns = {}
+        # indexes of source and target of each link
+        self._sources = array("i")
+        self._targets = array("i")
+        # position of each link in the arrays by key (see _edge_key)
+        self._edges = {}
+        self._edge_columns = {}
+
+    def is_directed(self):
+        return self.directed
+
+    def __contains__(self, node):
+        try:
+            return node in self._index
+        except TypeError:
+            return False
+
+    has_node = __contains__
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def number_of_nodes(self):
+        return len(self._ids)
+
+    def number_of_edges(self):
+        return len(self._sources)
+
+    def _add_node(self, node):
+        """
+        returns the index of ``node``, adding it if necessary
+        """
+        index = self._index.get(node)
+        if index is None:
+            node = intern(node)
+            index = self._index[node] = len(self._ids)
+            self._ids.append(node)
+        return index
+
+    def _edge_key(self, source, target):
+        """
+        returns an integer which identifies the link between the nodes
+        with indexes ``source`` and ``target``, which on undirected
+        graphs does not depend on the direction of the link
+        """
+        if not self.directed and source > target:
+            source, target = target, source
+        return source << 32 | target
+
+    def _set_attributes(self, columns, index, attributes):
+        for key, value in attributes.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[sys.intern(key)] = _Column()
+            column.set(index, value)
+
+    def _get_attributes(self, columns, index):
+        attributes = {}
+        for key, column in columns.items():
+            value = column.get(index)
+            if value is not _MISSING:
+                attributes[key] = value
+        return attributes
+
+    def add_node(self, node, **attributes):
+        """
+        Adds a node or updates the attributes of an existing node
+        """
+        index = self._add_node(node)
+        self._set_attributes(self._node_columns, index, attributes)
+
+    def add_edge(self, source, target, **attributes):
+        """
+        Adds a link, adding its nodes if necessary,
+        or updates the attributes of an existing link
+        """
+        source_index = self._add_node(source)
+        target_index = self._add_node(target)
+        key = self._edge_key(source_index, target_index)
+        position = self._edges.get(key)
+        if position is None:
+            position = self._edges[key] = len(self._sources)
+            # links are stored in the same direction in which
+            # networkx reports them: from the node added first
+            if not self.directed and source_index > target_index:
+                source_index, target_index = target_index, source_index
+            self._sources.append(source_index)
+            self._targets.append(target_index)
+        self._set_attributes(self._edge_columns, position, attributes)
+
+    def has_edge(self, source, target):
+        try:
+            key = self._edge_key(self._index[source], self._index[target])
+        except (KeyError, TypeError):
+            return False
+        return key in self._edges
+
+    @property
+    def nodes(self):
+        """
+        Like in networkx, ``graph.nodes(data=False)`` returns an iterator
+        of node IDs or, if ``data`` is ``True``, of ``(node, attributes)``
+        tuples, while ``graph.nodes[node]`` returns the attributes of
+        a node; the attribute dicts are built on the fly, modifying them
+        does not affect the graph
+        """
+        return _NodeView(self)
+
+    def get_edge_data(self, source, target, default=None):
+        """
+        Returns the attributes of the link between ``source`` and
+        ``target``, or ``default`` if there is no such link
+        """
+        try:
+            key = self._edge_key(self._index[source], self._index[target])
+            position = self._edges[key]
+        except (KeyError, TypeError):
+            return default
+        return self._get_attributes(self._edge_columns, position)
+
+    def edges(self, data=False):
+        """
+        Returns an iterator of ``(source, target)`` tuples or,
+        if ``data`` is ``True``, of ``(source, target, attributes)``
+        """
+        ids = self._ids
+        if not data:
+            return (
+                (ids[source], ids[target])
+                for source, target in zip(self._sources, self._targets)
+            )
+        return (
+            (ids[source], ids[target], self._get_attributes(self._edge_columns, i))
+            for i, (source, target) in enumerate(zip(self._sources, self._targets))
+        )
+
+    def to_networkx(self):
+        """
+        Returns an equivalent ``networkx.Graph`` or ``networkx.DiGraph``
+        """
+        import networkx
+
+        graph = networkx.DiGraph() if self.directed else networkx.Graph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from(self.edges(data=True))
+        return graph
+
+
+class _NodeView(object):
+    """
+    nodes of a ``CompactGraph``, see ``CompactGraph.nodes``
+    """
+
+    __slots__ = ("graph",)
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __call__(self, data=False):
+        graph = self.graph
+        if not data:
+            return iter(graph._ids)
+        return (
+            (node, graph._get_attributes(graph._node_columns, index))
+            for index, node in enumerate(graph._ids)
+        )
+
+    def __getitem__(self, node):
+        graph = self.graph
+        return graph._get_attributes(graph._node_columns, graph._index[node])
+
+    def __iter__(self):
+        return iter(self.graph._ids)
+
+    def __len__(self):
+        return len(self.graph._ids)
+
+    def __contains__(self, node):
+        return node in self.graph
@@ -0,0 +1,132 @@
+import json
+
+# in order of preference
+BACKENDS = ("orjson", "ujson", "simdjson", "json")
+
+# name, loads and dumps of the backend in use,
+# the fastest installed library is selected on first use
+_name = None
+_loads = None
+_dumps = None
+
+
+def _import_backend(name):
+    """
+    returns the ``loads`` and ``dumps`` functions of a backend,
+    ``dumps`` is ``None`` if the library can't encode JSON;
+    raises ``ImportError`` if the library is not installed
+    """
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads, lambda obj: orjson.dumps(obj).decode()
+    if name == "ujson":
+        import ujson
+
+        return ujson.loads, lambda obj: ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False
+        )
+    if name == "simdjson":
+        import simdjson
+
+        return simdjson.loads, None
+    if name == "json":
+        return json.loads, None
+    raise ValueError(
+        "unknown JSON backend {0!r}, choices are: {1}".format(name, ", ".join(BACKENDS))
+    )
+
+
+def _select_backend():
+    global _name, _loads
+    for name in BACKENDS:
+        try:
+            _loads = _import_backend(name)[0]
+        except ImportError:
+            continue
+        _name = name
+        return
+
+
+def set_json_backend(name=None):
+    """
+    Selects the library used to decode and encode JSON
+
+    By default the fastest installed library is used only for decoding,
+    while ``json()`` keeps using the standard library in order to return
+    the same output; a backend selected explicitly is also used to
+    encode JSON when no formatting arguments are passed to ``json()``,
+    the resulting output is compact (no whitespace) but keeps the same
+    ordering.
+
+    :param name: one of ``orjson``, ``ujson``, ``simdjson``, ``json``,
+                 ``None`` restores the automatic selection
+    """
+    global _name, _loads, _dumps
+    if name is None:
+        _name = _loads = _dumps = None
+        return
+    _loads, _dumps = _import_backend(name)
+    _name = name
+
+
+def get_json_backend():
+    """
+    Returns the name of the library used to decode JSON
+    """
+    if _loads is None:
+        _select_backend()
+    return _name
+
+
+def loads(data):
+    """
+    Decodes JSON with the selected backend, falls back to the
+    standard library for the data which the backend rejects
+    but the standard library accepts (eg: ``NaN``, ``Infinity``)
+    """
+    if _loads is None:
+        _select_backend()
+    try:
+        return _loads(data)
+    except ValueError:
+        if _loads is json.loads:
+            raise
+        return json.loads(data)
+
+
+def separators():
+    """
+    Returns the item and key separators used by ``dumps``
+    when no formatting arguments are passed
+    """
+    if _dumps is None:
+        return ", ", ": "
+    return ",", ":"
+
+
+def dumps(obj, **kwargs):
+    """
+    Encodes JSON with the standard library, unless a backend
+    which can encode JSON has been selected explicitly
+    and no formatting arguments have been passed
+    """
+    if _dumps is None or kwargs:
+        return json.dumps(obj, **kwargs)
+    try:
+        data = _dumps(obj)
+    except (TypeError, ValueError, OverflowError):
+        return json.dumps(obj)
+    # orjson encodes NaN and Infinity as null, each non-finite float adds
+    # a null to the ones of the None values, which are not counted for the
+    # nested objects in order to avoid walking them: in that case the
+    # standard library is used, which returns NaN and Infinity
+    if data.count("null") != _count_none(obj):
+        return json.dumps(obj, separators=separators(), ensure_ascii=False)
+    return data
+
+
+def _count_none(obj):
+    if isinstance(obj, dict):
+        return sum(value is None for value in obj.values())
+    return int(obj is None)
@@ -1,11 +1,19 @@
-import json
-
-import networkx
-import requests
-from Exscript.protocols import telnetlib
+import contextlib
+import hashlib
+import itertools
 
+from .. import json_backend
 from ..exceptions import ConversionException, TopologyRetrievalError
-from ..utils import _netjson_networkgraph, diff
+from ..graph import CompactGraph
+from ..sessions import get_default_session
+from ..transports import get_transport
+from ..utils import (
+    _iter_lines,
+    _netjson_networkgraph,
+    _netjson_networkgraph_chunks,
+    _read_chunks,
+    diff,
+)
 
 try:
     import urlparse
@@ -24,6 +32,22 @@ class BaseParser(object):
     version = None
     revision = None
     metric = None
+    # attributes which affect the result of parsing,
+    # included in the checksum of the topology data
+    _checksum_attributes = ("directed", "compact", "version", "revision", "metric")
+    # whether parsing the same data always returns the same graph,
+    # which allows to reuse the graph of a previous parser
+    _cacheable = True
+    # returned by _get_http when the server replies 304 Not Modified
+    _not_modified = object()
+    # passed as data by afetch(), which retrieves and loads the data later
+    _deferred = object()
+    # whether the graph is shared with other parsers through ``previous``,
+    # in which case it's copied before being modified by apply_diff()
+    _graph_shared = False
+    # whether file-like objects are passed to to_python() and parse()
+    # as they are, otherwise their content is read beforehand
+    _streaming = False
 
     def __init__(
         self,
@@ -36,12 +60,18 @@ class BaseParser(object):
         timeout=None,
         verify=True,
         directed=False,
+        previous=None,
+        session=None,
+        compact=False,
     ):  # noqa
         """
         Initializes a new Parser
 
-        :param data: ``str`` or ``dict`` containing topology data
-        :param url: HTTP URL to retrieve topology data
+        :param data: ``str``, ``dict`` or file-like object (text or binary)
+                     containing topology data
+        :param url: URL to retrieve topology data, supported schemes:
+                    http, https, telnet, file, unix and the ones added
+                    with ``register_transport``
         :param file: path to file containing topology data
         :param version: routing protocol version
         :param revision: routing protocol revision
@@ -50,6 +80,13 @@ class BaseParser(object):
         :param verify: boolean (valid for HTTPS requests only)
         :param directed: whether the resulting graph should be directed
                          (undirected by default for backwards compatibility)
+        :param previous: parser instance of a previous retrieval of the same
+                         topology, if the new data is identical its graph is
+                         reused instead of converting and parsing the data again
+        :param session: ``requests.Session`` used for HTTP requests, defaults
+                        to the session set with ``set_default_session``
+        :param compact: whether the resulting graph should be a memory
+                        efficient ``CompactGraph`` instead of a networkx graph
         """
         if version:
             self.version = version
@@ -60,26 +97,208 @@ class BaseParser(object):
         self.timeout = timeout
         self.verify = verify
         self.directed = directed
-        if data is None and url is not None:
-            data = self._get_url(url)
-        elif data is None and file is not None:
-            data = self._get_file(file)
-        elif data is None and url is None and file is None:
+        self.compact = compact
+        self.session = session
+        self.url = url
+        self._parse_options = self._get_parse_options()
+        # validators of the previous response, used for conditional requests
+        self.etag, self.last_modified = self._get_validators(url, previous)
+        if data is None and url is None and file is None:
             raise ValueError(
                 "no topology data supplied, on of the following arguments"
                 "must be supplied: data, url or file"
             )
+        if data is not self._deferred:
+            self._fetch(data, url, file, previous)
+
+    def _fetch(self, data, url, file, previous):
+        """
+        Retrieves the topology data from ``url`` or ``file``
+        (unless ``data`` is supplied) and loads it
+        """
+        if data is None and url is not None:
+            data = self._get_url(url)
+            if hasattr(data, "close"):
+                # streams opened by transports are closed once parsed
+                with contextlib.closing(data):
+                    self._load(data, previous)
+                return
+        elif data is None and file is not None:
+            data = self._get_file(file)
+        self._load(data, previous)
+
+    def _load(self, data, previous):
+        """
+        Converts and parses the topology data,
+        unless ``previous`` has the same data
+        """
+        if hasattr(data, "read") and not self._streaming:
+            data = self._read_stream(data)
+        if data is self._not_modified:
+            self.checksum = previous.checksum
+            self._reuse(previous)
+            return
+        self.checksum = self._get_checksum(data)
+        if self._is_unchanged(previous):
+            self._reuse(previous)
+            return
         self.original_data = self.to_python(data)
         # avoid throwing NotImplementedError in tests
         if self.__class__ is not BaseParser:
             self.graph = self.parse(self.original_data)
 
+    def _get_parse_options(self):
+        """
+        Returns a string representing the parser class and
+        the attributes which affect the result of parsing
+        """
+        options = [self.__class__.__module__, self.__class__.__qualname__]
+        options += [getattr(self, attr) for attr in self._checksum_attributes]
+        return repr(options)
+
+    def _get_checksum(self, data):
+        """
+        Returns a digest of the raw topology data and of the attributes
+        which affect parsing, returns ``None`` if the data is not a string
+        or if the parser does not support reusing previous results
+        """
+        if isinstance(data, str):
+            data = data.encode()
+        if not self._cacheable or not isinstance(data, bytes):
+            return None
+        checksum = hashlib.sha1(self._parse_options.encode(), usedforsecurity=False)
+        checksum.update(data)
+        return checksum.hexdigest()
+
+    def _get_validators(self, url, previous):
+        """
+        Returns the ``ETag`` and ``Last-Modified`` values received by
+        ``previous`` if it retrieved the same URL with the same options
+        """
+        if (
+            not self._cacheable
+            or previous is None
+            or previous.__class__ is not self.__class__
+            or previous.url != url
+            or previous._parse_options != self._parse_options
+        ):
+            return None, None
+        return previous.etag, previous.last_modified
+
+    def _is_unchanged(self, previous):
+        """
+        Returns ``True`` if ``previous`` was created
+        by the same parser from identical data
+        """
+        return (
+            previous is not None
+            and self.checksum is not None
+            and previous.__class__ is self.__class__
+            and previous.checksum == self.checksum
+        )
+
+    def _reuse(self, previous):
+        """
+        Reuses the converted data, the graph and the metadata of ``previous``,
+        parsers which keep other state about the data should extend it
+        """
+        self.original_data = previous.original_data
+        if hasattr(previous, "graph"):
+            self.graph = previous.graph
+            self._graph_shared = previous._graph_shared = True
+        self.protocol = previous.protocol
+        self.version = previous.version
+        self.revision = previous.revision
+        self.metric = previous.metric
+
+    @classmethod
+    async def afetch(cls, url=None, file=None, semaphore=None, executor=None, **kwargs):
+        """
+        Asynchronous counterpart of ``cls(url=url, file=file, **kwargs)``
+
+        Telnet and plain HTTP URLs are read with asyncio streams, while the
+        other retrievals (HTTPS, HTTP with a session, redirects, files and
+        the other transports) run in ``executor``, as does parsing, so that
+        the event loop is not blocked.
+
+        :param semaphore: ``asyncio.Semaphore`` shared by concurrent calls
+                          in order to limit the number of retrievals
+        :param executor: ``concurrent.futures.Executor`` used for blocking
+                         operations, defaults to the default executor of
+                         the event loop, whose number of threads limits
+                         the number of concurrent blocking retrievals
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        previous = kwargs.get("previous")
+        async with semaphore or contextlib.nullcontext():
+            parser = cls(data=cls._deferred, url=url, file=file, **kwargs)
+            data = None
+            scheme = urlparse.urlparse(url).scheme if url is not None else None
+            if scheme == "telnet":
+                data = await cls._aget_telnet(urlparse.urlparse(url), parser.timeout)
+            elif scheme == "http" and not (parser.session or get_default_session()):
+                data = await parser._aget_http(urlparse.urlparse(url))
+            await loop.run_in_executor(
+                executor, parser._fetch, data, url, file, previous
+            )
+            return parser
+
+    async def _aget_http(self, url):
+        """
+        Asynchronous HTTP/1.1 GET request, returns ``None``
+        in case of redirects, which are left to ``_get_http``
+        """
+        import asyncio
+
+        request = ["GET {0} HTTP/1.1".format(_request_target(url))]
+        request.append("Host: {0}".format(_host(url)))
+        if url.username is not None:
+            request.append("Authorization: {0}".format(_basic_auth(url)))
+        request += ["{0}: {1}".format(*h) for h in self._get_http_headers().items()]
+        request += ["Accept-Encoding: identity", "Connection: close", "", ""]
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(url.hostname, url.port or 80), self.timeout
+            )
+        except Exception as e:
+            raise TopologyRetrievalError(e)
+        try:
+            writer.write("\r\n".join(request).encode("latin-1"))
+            status, headers, content = await asyncio.wait_for(
+                _aread_http_response(reader), self.timeout
+            )
+        except Exception as e:
+            raise TopologyRetrievalError(e)
+        finally:
+            writer.close()
+        if status in (301, 302, 303, 307, 308) and "location" in headers:
+            return None
+        return self._http_response_data(status, headers, content)
+
+    @staticmethod
+    async def _aget_telnet(url, timeout):
+        import asyncio
+
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(url.hostname, url.port or 23), timeout
+            )
+        except Exception as e:
+            raise TopologyRetrievalError(e)
+        try:
+            writer.write(("\r\n").encode("ascii"))
+            data = await asyncio.wait_for(reader.read(), timeout)
+        except Exception as e:
+            raise TopologyRetrievalError(e)
+        finally:
+            writer.close()
+        return data.decode("ascii")
+
     def _get_url(self, url):
         url = urlparse.urlparse(url)
-        if url.scheme in ["http", "https"]:
-            return self._get_http(url)
-        if url.scheme == "telnet":
-            return self._get_telnet(url)
+        return get_transport(url.scheme)(self, url)
 
     def __sub__(self, other):
         return diff(other, self)
@@ -90,7 +309,7 @@ class BaseParser(object):
         Input data might be:
             * a path which points to a JSON file
             * a URL which points to a JSON file
-              (supported schemes: http, https, telnet)
+              (see ``netdiff.register_transport`` for supported schemes)
             * a JSON formatted string
             * a dict representing a JSON structure
         """
@@ -99,11 +318,36 @@ class BaseParser(object):
         elif isinstance(data, str):
             # assuming is JSON
             try:
-                return json.loads(data)
+                return json_backend.loads(data)
             except ValueError:
                 pass
         raise ConversionException("Could not recognize format", data=data)
 
+    def _read_stream(self, stream):
+        try:
+            data = stream.read()
+        except Exception as e:
+            raise TopologyRetrievalError(e)
+        if isinstance(data, bytes):
+            data = data.decode()
+        return data
+
+    def _stream_to_python(self, stream):
+        """
+        Used by parsers which support formats other than JSON:
+        reads and decodes the whole stream only if it contains
+        a JSON object, otherwise returns an iterator of its lines
+        """
+        chunks = _read_chunks(stream)
+        start = ""
+        for chunk in chunks:
+            start += chunk
+            if start.strip():
+                break
+        if start.lstrip().startswith("{"):
+            return BaseParser.to_python(self, start + "".join(chunks))
+        return _iter_lines(itertools.chain([start], chunks))
+
     def _get_file(self, path):
         try:
             return open(path).read()
@@ -111,18 +355,55 @@ class BaseParser(object):
             raise TopologyRetrievalError(e)
 
     def _get_http(self, url):
+        http = self.session or get_default_session()
+        if http is None:
+            # without a session a new connection is opened for each request
+            import requests as http
         try:
-            response = requests.get(
-                url.geturl(), verify=self.verify, timeout=self.timeout
+            response = http.get(
+                url.geturl(),
+                headers=self._get_http_headers(),
+                verify=self.verify,
+                timeout=self.timeout,
             )
         except Exception as e:
             raise TopologyRetrievalError(e)
-        if response.status_code != 200:
-            msg = "Expecting HTTP 200 ok, got {0}".format(response.status_code)
+        return self._http_response_data(
+            response.status_code, response.headers, response.content
+        )
+
+    def _get_http_headers(self):
+        """
+        Returns the headers of conditional requests, if the validators
+        of the previous response are known
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def _http_response_data(self, status, headers, content):
+        """
+        Stores the validators of the response and returns its content,
+        ``_not_modified`` if the server replied 304 Not Modified;
+        ``headers`` must have case insensitive lowercase keys
+        """
+        if status == 304 and self._get_http_headers():
+            self.etag = headers.get("etag", self.etag)
+            self.last_modified = headers.get("last-modified", self.last_modified)
+            return self._not_modified
+        if status != 200:
+            msg = "Expecting HTTP 200 ok, got {0}".format(status)
             raise TopologyRetrievalError(msg)
-        return response.content.decode()
+        self.etag = headers.get("etag")
+        self.last_modified = headers.get("last-modified")
+        return content.decode()
 
     def _get_telnet(self, url):
+        from Exscript.protocols import telnetlib
+
         try:
             tn = telnetlib.Telnet(url.hostname, url.port, timeout=self.timeout)
         except Exception as e:
@@ -133,6 +414,10 @@ class BaseParser(object):
         return data
 
     def _init_graph(self):
+        if self.compact:
+            return CompactGraph(directed=self.directed)
+        import networkx
+
         return networkx.DiGraph() if self.directed else networkx.Graph()
 
     def parse(self, data):
@@ -140,6 +425,7 @@ class BaseParser(object):
         Converts the original python data structure into a NetworkX Graph object
         Must be implemented by subclasses.
         Must return an instance of <networkx.Graph>
+        (or of <netdiff.CompactGraph> if ``self.compact`` is ``True``)
         """
         raise NotImplementedError()
 
@@ -161,3 +447,99 @@ class BaseParser(object):
             dict,
             **kwargs
         )
+
+    def json_chunks(self):
+        """
+        Generator which outputs NetJSON format in chunks of text,
+        the concatenation of the chunks is equal to ``json()``;
+        nodes and links are encoded one at a time, which avoids
+        holding a copy of the whole topology in memory
+        """
+        try:
+            graph = self.graph
+        except AttributeError:
+            raise NotImplementedError()
+        return _netjson_networkgraph_chunks(
+            self.protocol,
+            self.version,
+            self.revision,
+            self.metric,
+            graph.nodes(data=True),
+            graph.edges(data=True),
+        )
+
+    def json_stream(self, fp):
+        """
+        Writes NetJSON format to ``fp``, a text file-like
+        object (eg: a file or ``socket.makefile("w")``),
+        one node or link at a time
+        """
+        for chunk in self.json_chunks():
+            fp.write(chunk)
+
+
+def _request_target(url):
+    target = url.path or "/"
+    if url.query:
+        target += "?" + url.query
+    return target
+
+
+def _host(url):
+    """
+    returns the value of the ``Host`` header,
+    which does not include the credentials
+    """
+    host = url.hostname
+    if ":" in host:
+        # IPv6 address
+        host = "[{0}]".format(host)
+    if url.port is not None:
+        host += ":{0}".format(url.port)
+    return host
+
+
+def _basic_auth(url):
+    """
+    returns the value of the ``Authorization`` header for the
+    credentials of ``url``, as sent by ``requests``
+    """
+    import base64
+
+    credentials = "{0}:{1}".format(
+        urlparse.unquote(url.username), urlparse.unquote(url.password or "")
+    )
+    return "Basic " + base64.b64encode(credentials.encode("latin-1")).decode()
+
+
+async def _aread_http_response(reader):
+    """
+    Reads an HTTP/1.1 response, returns the status code,
+    the headers (with lowercase names) and the body
+    """
+    status_line = await reader.readline()
+    try:
+        status = int(status_line.split()[1])
+    except (IndexError, ValueError):
+        raise TopologyRetrievalError(
+            "Invalid HTTP status line: {0!r}".format(status_line)
+        )
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return status, headers, b"".join(chunks)
+    if "content-length" in headers:
+        return status, headers, await reader.readexactly(int(headers["content-length"]))
+    return status, headers, await reader.read()
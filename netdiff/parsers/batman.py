@@ -1,4 +1,5 @@
 from ..exceptions import ConversionException, ParserError
+from ..graph import intern
 from .base import BaseParser
 
 
@@ -11,59 +12,88 @@ class BatmanParser(BaseParser):
 
     # the default expected format
     _format = "alfred_vis"
+    _streaming = True
 
     def to_python(self, data):
         """
-        Adds support for txtinfo format
+        Adds support for txtinfo format, streams containing
+        txtinfo are returned as iterators of lines, which
+        are read by ``parse()`` while they are received
         """
+        if hasattr(data, "read"):
+            data = self._stream_to_python(data)
+            if not isinstance(data, dict):
+                self._format = "txtinfo_stream"
+            return data
         try:
             return super().to_python(data)
         except ConversionException as e:
             return self._txtinfo_to_python(e.data)
 
+    def _reuse(self, previous):
+        """
+        Reuses also the format of the data, which is not
+        detected again since the data is not converted
+        """
+        super()._reuse(previous)
+        self._format = previous._format
+
     def _txtinfo_to_python(self, data):
         """
         Converts txtinfo format to python
         """
         self._format = "txtinfo"
+        # convert to python list
+        return [
+            {"source": source, "target": target, "cost": cost}
+            for source, target, cost in self._iter_txtinfo(data.split("\n"))
+        ]
+
+    def _iter_txtinfo(self, lines):
+        """
+        Generator which returns ``(source, target, cost)``
+        for each link of the txtinfo topology table
+        """
+        lines = iter(lines)
         # find interesting section
-        lines = data.split("\n")
-        try:
-            start = lines.index("Table: Topology") + 2
-        except ValueError:
+        for line in lines:
+            if line.rstrip("\r") == "Table: Topology":
+                break
+        else:
             raise ParserError("Unrecognized format")
-        topology_lines = [line for line in lines[start:] if line]
-        # convert to python list
-        parsed_lines = []
-        for line in topology_lines:
+        # skip header
+        next(lines, None)
+        for line in lines:
+            line = line.rstrip("\r")
+            if not line:
+                continue
             values = line.split(" ")
-            parsed_lines.append(
-                {"source": values[0], "target": values[1], "cost": float(values[4])}
-            )
-        return parsed_lines
+            try:
+                yield intern(values[0]), intern(values[1]), float(values[4])
+            except (IndexError, ValueError):
+                raise ParserError("Unrecognized format")
 
-    def _get_primary_address(self, mac_address, node_list):
+    def _get_primary_address(self, mac_address, primary_addresses):
         """
-        Uses the _get_aggregated_node_list structure to find
+        Uses the _get_primary_addresses structure to find
         the primary mac address associated to a secondary one,
         if none is found returns itself.
         """
-        for local_addresses in node_list:
-            if mac_address in local_addresses:
-                return local_addresses[0]
-        return mac_address
+        return primary_addresses.get(mac_address, mac_address)
 
-    def _get_aggregated_node_list(self, data):
+    def _get_primary_addresses(self, data):
         """
-        Returns list of main and secondary mac addresses.
+        Returns a dict which maps main and secondary mac addresses
+        to the main mac address of their node; if an address
+        appears in more nodes the first one wins.
         """
-        node_list = []
+        primary_addresses = {}
         for node in data:
-            local_addresses = [node["primary"]]
-            if "secondary" in node:
-                local_addresses += node["secondary"]
-            node_list.append(local_addresses)
-        return node_list
+            primary = node["primary"]
+            primary_addresses.setdefault(primary, primary)
+            for mac_address in node.get("secondary", []):
+                primary_addresses.setdefault(mac_address, primary)
+        return primary_addresses
 
     def parse(self, data):
         """
@@ -71,6 +101,7 @@ class BatmanParser(BaseParser):
         which can be one of the wollowing:
             * alfred_vis
             * txtinfo
+            * txtinfo_stream
         """
         method = getattr(self, "_parse_{0}".format(self._format))
         return method(data)
@@ -81,28 +112,34 @@ class BatmanParser(BaseParser):
         to a NetworkX Graph object which is then returned.
         Additionally checks for "source_vesion" to determine the batman-adv version.
         """
-        # initialize graph and list of aggregated nodes
+        # initialize graph and index of primary addresses
         graph = self._init_graph()
         if "source_version" in data:
             self.version = data["source_version"]
         if "vis" not in data:
             raise ParserError('Parse error, "vis" key not found')
-        node_list = self._get_aggregated_node_list(data["vis"])
+        primary_addresses = self._get_primary_addresses(data["vis"])
 
         # loop over topology section and create networkx graph
         for node in data["vis"]:
+            # nodes without neighbors are not added
+            if not node["neighbors"]:
+                continue
+            primary = intern(node["primary"])
+            graph.add_node(
+                primary,
+                **{
+                    "local_addresses": node.get("secondary", []),
+                    "clients": node.get("clients", []),
+                }
+            )
             for neigh in node["neighbors"]:
-                graph.add_node(
-                    node["primary"],
-                    **{
-                        "local_addresses": node.get("secondary", []),
-                        "clients": node.get("clients", []),
-                    }
+                primary_neigh = self._get_primary_address(
+                    neigh["neighbor"], primary_addresses
                 )
-                primary_neigh = self._get_primary_address(neigh["neighbor"], node_list)
                 # networkx automatically ignores duplicated edges
                 graph.add_edge(
-                    node["primary"], primary_neigh, weight=float(neigh["metric"])
+                    primary, intern(primary_neigh), weight=float(neigh["metric"])
                 )
         return graph
 
@@ -115,3 +152,13 @@ class BatmanParser(BaseParser):
         for link in data:
             graph.add_edge(link["source"], link["target"], weight=link["cost"])
         return graph
+
+    def _parse_txtinfo_stream(self, data):
+        """
+        Adds the links of an iterator of txtinfo lines to
+        a NetworkX Graph object while they are read
+        """
+        graph = self._init_graph()
+        for source, target, cost in self._iter_txtinfo(data):
+            graph.add_edge(source, target, weight=cost)
+        return graph
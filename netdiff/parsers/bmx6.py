@@ -1,4 +1,5 @@
 from ..exceptions import ParserError
+from ..graph import intern
 from .base import BaseParser
 
 
@@ -25,8 +26,8 @@ class Bmx6Parser(BaseParser):
             for link in node["links"]:
                 cost = (link["txRate"] + link["rxRate"]) / 2.0
                 graph.add_edge(
-                    node["name"],
-                    link["name"],
+                    intern(node["name"]),
+                    intern(link["name"]),
                     weight=cost,
                     tx_rate=link["txRate"],
                     rx_rate=link["rxRate"],
@@ -17,6 +17,8 @@ class CnmlParser(BaseParser):
     protocol = "static"
     version = None
     metric = None
+    # data is usually a path or URL, whose contents may change
+    _cacheable = False
 
     def to_python(self, data):
         if isinstance(data, str):
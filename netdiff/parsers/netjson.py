@@ -1,48 +1,210 @@
-from ..exceptions import ParserError
+import json
+
+from ..exceptions import ConversionException, ParserError
+from ..graph import intern
+from ..utils import _link_attributes, _node_attributes, _read_chunks
 from .base import BaseParser
 
+# size of the chunks read from streams
+CHUNK_SIZE = 65536
+WHITESPACE = " \t\n\r"
+# length of the longest token which is invalid when truncated ("-Infinity"),
+# errors found farther from the end of the buffer can't be fixed by reading
+TOKEN_SIZE = 10
+
 
 class NetJsonParser(BaseParser):
     """NetJSON (0.1) parser"""
 
+    _streaming = True
+
+    def to_python(self, data):
+        """
+        File-like objects are returned as they are,
+        they are decoded incrementally by ``parse()``
+        """
+        if hasattr(data, "read"):
+            return data
+        return super().to_python(data)
+
     def parse(self, data):
         """
         Converts a NetJSON 'NetworkGraph' object
         to a NetworkX Graph object,which is then returned.
         Additionally checks for protocol version, revision and metric.
         """
+        if hasattr(data, "read"):
+            return self._parse_stream(data)
         graph = self._init_graph()
+        self._check_metadata(data)
+        # create graph
+        for node in data["nodes"]:
+            self._add_node(graph, node)
+        for link in data["links"]:
+            self._add_link(graph, link)
+        return graph
+
+    def _parse_stream(self, stream):
+        """
+        Adds nodes and links to the graph while they are decoded
+        from ``stream``, without holding the whole document in memory;
+        the metadata is checked once the end of the document is reached
+        """
+        graph = self._init_graph()
+        data = {}
+        for key, value, item in _iter_networkgraph(stream):
+            if not item:
+                data[key] = value
+                if key == "type":
+                    self._check_type(data)
+            elif key == "nodes":
+                self._add_node(graph, value)
+            else:
+                self._add_link(graph, value)
+        self._check_metadata(data)
+        return graph
+
+    def _check_type(self, data):
         # ensure is NetJSON NetworkGraph object
         if "type" not in data or data["type"] != "NetworkGraph":
             raise ParserError("Parse error, not a NetworkGraph object")
+
+    def _check_metadata(self, data):
+        self._check_type(data)
         # ensure required keys are present
         required_keys = ["protocol", "version", "metric", "nodes", "links"]
         for key in required_keys:
             if key not in data:
                 raise ParserError('Parse error, "{0}" key not found'.format(key))
-
         # store metadata
         self.protocol = data["protocol"]
         self.version = data["version"]
         self.revision = data.get("revision")  # optional
         self.metric = data["metric"]
 
-        # create graph
-        for node in data["nodes"]:
-            graph.add_node(
-                node["id"],
-                label=node["label"] if "label" in node else None,
-                local_addresses=node.get("local_addresses", []),
-                **node.get("properties", {})
+    def _add_node(self, graph, node):
+        graph.add_node(intern(node["id"]), **_node_attributes(node))
+
+    def _add_link(self, graph, link):
+        try:
+            source = link["source"]
+            dest = link["target"]
+            attributes = _link_attributes(link)
+        except KeyError as e:
+            raise ParserError('Parse error, "%s" key not found' % e)
+        graph.add_edge(intern(source), intern(dest), **attributes)
+
+
+class _StreamReader(object):
+    """
+    buffers the text read from a text or binary stream
+    and decodes one JSON value at a time
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.chunks = _read_chunks(stream, CHUNK_SIZE)
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _read(self):
+        """
+        appends a chunk to the buffer, discarding the consumed text,
+        returns ``False`` once the end of the stream has been reached
+        """
+        if self.eof:
+            return False
+        chunk = next(self.chunks, "")
+        if not chunk:
+            self.eof = True
+        position, self.position = self.position, 0
+        self.buffer = self.buffer[position:] + chunk
+        return not self.eof
+
+    def next_char(self):
+        """
+        returns the next character which is not whitespace
+        without consuming it, an empty string at the end of the stream
+        """
+        while True:
+            while self.position < len(self.buffer):
+                if self.buffer[self.position] not in WHITESPACE:
+                    return self.buffer[self.position]
+                self.position += 1
+            if not self._read():
+                return ""
+
+    def expect(self, characters):
+        char = self.next_char()
+        if not char or char not in characters:
+            raise ConversionException(
+                "Expecting one of {0!r}, got {1!r}".format(characters, char),
+                data=self.stream,
             )
-        for link in data["links"]:
+        self.position += 1
+        return char
+
+    def value(self, decoder=json.JSONDecoder()):
+        """
+        decodes the next JSON value, reading more data when the value is
+        incomplete or might continue after the end of the buffer (numbers)
+        """
+        self.next_char()
+        while True:
             try:
-                source = link["source"]
-                dest = link["target"]
-                cost = link["cost"]
-                cost_text = link.get("cost_text", "")
-            except KeyError as e:
-                raise ParserError('Parse error, "%s" key not found' % e)
-            properties = link.get("properties", {})
-            graph.add_edge(source, dest, weight=cost, cost_text=cost_text, **properties)
-        return graph
+                value, end = decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError as e:
+                if self._is_truncated(e) and self._read():
+                    continue
+                raise ConversionException(
+                    "Could not decode JSON: {0}".format(e), data=self.stream
+                )
+            # numbers and literals might be truncated
+            last = self.buffer[end - 1]
+            if end == len(self.buffer) and last not in '"]}' and self._read():
+                continue
+            self.position = end
+            return value
+
+    def _is_truncated(self, error):
+        """
+        returns ``True`` if the decoding ``error`` may be caused by
+        the end of the buffer, in which case more data must be read
+        """
+        if error.msg.startswith("Unterminated string"):
+            # the position is the start of the string
+            return True
+        return len(self.buffer) - error.pos <= TOKEN_SIZE
+
+
+def _iter_networkgraph(stream):
+    """
+    generator which decodes the JSON object contained in ``stream``
+    incrementally, returns ``(key, value, False)`` for each member,
+    except for the ``nodes`` and ``links`` arrays, which are returned
+    as ``(key, [], False)`` followed by ``(key, element, True)``
+    for each one of their elements
+    """
+    reader = _StreamReader(stream)
+    reader.expect("{")
+    if reader.next_char() == "}":
+        reader.position += 1
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in ["nodes", "links"] and reader.next_char() == "[":
+            reader.position += 1
+            yield key, [], False
+            if reader.next_char() == "]":
+                reader.position += 1
+            else:
+                while True:
+                    yield key, reader.value(), True
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            yield key, reader.value(), False
+        if reader.expect(",}") == "}":
+            return
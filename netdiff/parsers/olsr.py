@@ -1,4 +1,8 @@
+from collections.abc import Iterator
+
 from ..exceptions import ConversionException, ParserError
+from ..graph import intern
+from ..utils import _iter_string_lines
 from .base import BaseParser
 
 
@@ -8,15 +12,20 @@ class OlsrParser(BaseParser):
     protocol = "OLSR"
     version = "0.8"
     metric = "ETX"
+    _streaming = True
 
     def to_python(self, data):
         """
-        Adds support for txtinfo format
+        Adds support for txtinfo format, which is returned
+        as it is (or as an iterator of lines in the case of
+        streams) and is read by ``parse()`` in a single pass
         """
+        if hasattr(data, "read"):
+            return self._stream_to_python(data)
         try:
             return super().to_python(data)
         except ConversionException as e:
-            return self._txtinfo_to_jsoninfo(e.data)
+            return e.data
 
     def parse(self, data):
         """
@@ -24,8 +33,11 @@ class OlsrParser(BaseParser):
         to a NetworkX Graph object, which is then returned.
         Additionally checks for "config" data in order to determine version and revision.
         """
+        if isinstance(data, (str, Iterator)):
+            # txtinfo, see to_python()
+            return self._parse_txtinfo(data)
         graph = self._init_graph()
-        if "topology" not in data:
+        if not isinstance(data, dict) or "topology" not in data:
             raise ParserError('Parse error, "topology" key not found')
         elif "mid" not in data:
             raise ParserError('Parse error, "mid" key not found')
@@ -54,8 +66,8 @@ class OlsrParser(BaseParser):
         # loop over topology section and create networkx graph
         for link in data["topology"]:
             try:
-                source = link["lastHopIP"]
-                target = link["destinationIP"]
+                source = intern(link["lastHopIP"])
+                target = intern(link["destinationIP"])
                 cost = link["tcEdgeCost"]
                 properties = {
                     "link_quality": link["linkQuality"],
@@ -77,54 +89,84 @@ class OlsrParser(BaseParser):
             graph.add_edge(source, target, weight=cost, **properties)
         return graph
 
-    def _txtinfo_to_jsoninfo(self, data):
-        """
-        converts olsr 1 txtinfo format to jsoninfo
+    def _parse_txtinfo(self, data):
         """
-        # replace INFINITE with inf, which is convertible to float
-        data = data.replace("INFINITE", "inf")
-        # find interesting section
-        lines = data.split("\n")
+        Reads olsr 1 txtinfo format in a single pass and adds the links
+        of the Topology table directly to a NetworkX Graph object,
+        the aliases of the MID table (which follows the Topology table)
+        are assigned to the nodes at the end.
 
-        # process links in topology section
-        try:
-            start = lines.index("Table: Topology") + 2
-            end = lines[start:].index("") + start
-        except ValueError:
+        :param data: ``str`` or iterable of lines
+        """
+        graph = self._init_graph()
+        alias_dict = {}
+        # endpoints of the links with infinite cost
+        endpoints = set()
+        if isinstance(data, str):
+            data = _iter_string_lines(data)
+        found = set()
+        for table, line in _iter_txtinfo(data, ["Table: Topology", "Table: MID"]):
+            if line is None:
+                found.add(table)
+            elif table == "Table: Topology":
+                self._add_txtinfo_link(graph, line, alias_dict, endpoints)
+            else:
+                self._add_txtinfo_alias(alias_dict, line)
+        if len(found) < 2:
             raise ParserError("Unrecognized format")
-        topology_lines = lines[start:end]
-        # convert topology section to jsoninfo format
-        topology = []
-        for line in topology_lines:
-            values = line.split("\t")
-            topology.append(
-                {
-                    "destinationIP": values[0],
-                    "lastHopIP": values[1],
-                    "linkQuality": float(values[2]),
-                    "neighborLinkQuality": float(values[3]),
-                    "tcEdgeCost": float(values[4]) * 1024.0,
-                }
-            )
+        # add the aliases which were not known while reading the links
+        for node, local_addresses in alias_dict.items():
+            if node in graph or node in endpoints:
+                graph.add_node(node, local_addresses=local_addresses)
+        return graph
 
-        # process alias (MID) section
+    def _add_txtinfo_link(self, graph, line, alias_dict, endpoints):
         try:
-            start = lines.index("Table: MID") + 2
-            end = lines[start:].index("") + start
+            target, source, link_quality, neighbor_link_quality, cost = line.replace(
+                "INFINITE", "inf"
+            ).split("\t")[:5]
+            cost = float(cost)
+            properties = {
+                "link_quality": float(link_quality),
+                "neighbor_link_quality": float(neighbor_link_quality),
+            }
         except ValueError:
             raise ParserError("Unrecognized format")
-        mid_lines = lines[start:end]
-        # convert mid section to jsoninfo format
-        mid = []
-        for line in mid_lines:
-            values = line.split("\t")
-            node = values[0]
-            aliases = values[1].split(";")
-            mid.append(
-                {
-                    "ipAddress": node,
-                    "aliases": [{"ipAddress": alias} for alias in aliases],
-                }
-            )
+        source, target = intern(source), intern(target)
+        # add nodes with their local_addresses
+        for node in [source, target]:
+            if node in alias_dict:
+                graph.add_node(node, local_addresses=alias_dict[node])
+        # skip links with infinite cost
+        if cost == float("inf"):
+            endpoints.update([source, target])
+            return
+        graph.add_edge(source, target, weight=cost, **properties)
+
+    def _add_txtinfo_alias(self, alias_dict, line):
+        node, _, aliases = line.partition("\t")
+        alias_dict[node] = aliases.split(";")
+
 
-        return {"topology": topology, "mid": mid}
+def _iter_txtinfo(lines, tables):
+    """
+    Generator which returns ``(table, line)`` for each row of the
+    first occurrence of the txtinfo ``tables`` found in ``lines``,
+    followed by ``(table, None)`` when the end of a table is reached
+    """
+    lines = iter(lines)
+    table = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if table is None:
+            if line in tables:
+                table = line
+                tables = [name for name in tables if name != table]
+                # skip header
+                next(lines, None)
+        # tables end with an empty line
+        elif not line:
+            yield table, None
+            table = None
+        else:
+            yield table, line
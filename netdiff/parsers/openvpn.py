@@ -12,6 +12,7 @@ class OpenvpnParser(BaseParser):
     version = "1"
     metric = "static"
     duplicate_cn = False
+    _checksum_attributes = BaseParser._checksum_attributes + ("duplicate_cn",)
     # for internal use only
     _server_common_name = "openvpn-server"
 
@@ -46,6 +47,7 @@ class OpenvpnParser(BaseParser):
             clients = data.client_list.values()
             links = data.routing_table.values()
         special_cases = self._find_special_cases(clients)
+        local_addresses_map = self._get_local_addresses(links)
         # add clients in graph as nodes
         for client in clients:
             if client.common_name == "UNDEF":
@@ -62,11 +64,7 @@ class OpenvpnParser(BaseParser):
                 "bytes_sent": int(client.bytes_sent),
                 "common_name": client.common_name,
             }
-            local_addresses = [
-                str(route.virtual_address)
-                for route in data.routing_table.values()
-                if route.real_address == address
-            ]
+            local_addresses = local_addresses_map.get(address)
             if local_addresses:
                 client_properties["local_addresses"] = local_addresses
             node_id = self.get_node_id(client, special_cases)
@@ -111,15 +109,27 @@ class OpenvpnParser(BaseParser):
             target_id = f"{target_id}:{address.port}"
         return target_id
 
+    def _get_local_addresses(self, routes):
+        """
+        Groups the virtual addresses of the routing table
+        by the real address of the client they belong to
+        """
+        local_addresses = {}
+        for route in routes:
+            local_addresses.setdefault(route.real_address, []).append(
+                str(route.virtual_address)
+            )
+        return local_addresses
+
     def _find_special_cases(self, clients):
         if not self.duplicate_cn:
-            return []
-        id_list = []
-        special_cases = []
+            return set()
+        id_set = set()
+        special_cases = set()
         for client in clients:
             id_ = f"{client.common_name},{client.real_address.host}"
-            if id_ in id_list:
-                special_cases.append(id_)
+            if id_ in id_set:
+                special_cases.add(id_)
                 continue
-            id_list.append(id_)
+            id_set.add(id_)
         return special_cases
@@ -1,4 +1,4 @@
-from copy import deepcopy
+import time
 from datetime import datetime, timedelta
 
 from ..exceptions import ConversionException, ParserError
@@ -12,6 +12,8 @@ class WireguardParser(BaseParser):
     version = "1"
     metric = "static"
     max_time_diff = timedelta(minutes=5)
+    # peers are considered connected depending on the current time
+    _cacheable = False
 
     def to_python(self, data):
         try:
@@ -33,6 +35,11 @@ class WireguardParser(BaseParser):
     def _parse_lines(self, lines):
         parsed_lines = {}
         last_device = None
+        # a single reference time for all the peers
+        now = time.time()
+        # formatted handshake times, most disconnected peers share
+        # the same value (zero, if they have never handshaked)
+        handshakes = {}
         for device, *options in lines:
             if device != last_device:
                 last_device = device
@@ -57,17 +64,18 @@ class WireguardParser(BaseParser):
                     transfer_tx,
                     persistent_keepalive,
                 ) = map(self.__parse_value, options)
-                connected, latest_handshake = self._parse_latest_handshake(
-                    latest_handshake
-                )
+                latest_handshake = int(latest_handshake)
+                connected = self._is_connected(latest_handshake, now)
+                if latest_handshake not in handshakes:
+                    handshakes[latest_handshake] = datetime.fromtimestamp(
+                        latest_handshake
+                    ).strftime("%Y-%m-%dT%H:%M:%SZ")
                 parsed_lines[device]["peers"].append(
                     {
                         public_key: dict(
                             preshared_key=preshared_key,
                             endpoint=endpoint,
-                            latest_handshake=latest_handshake.strftime(
-                                "%Y-%m-%dT%H:%M:%SZ"
-                            ),
+                            latest_handshake=handshakes[latest_handshake],
                             transfer_rx=transfer_rx,
                             transfer_tx=transfer_tx,
                             persistent_keepalive=persistent_keepalive,
@@ -78,27 +86,31 @@ class WireguardParser(BaseParser):
                 )
         return parsed_lines
 
-    def _parse_latest_handshake(self, latest_handshake):
+    def _is_connected(self, latest_handshake, now):
         """
         If the device hasn't handshaked for more than 5 minutes (by default)
         or if it has never handshaked (handshake is zero) we assume the device
         is not connected.
         """
-        connection_time = datetime.fromtimestamp(int(latest_handshake))
         return (
-            int(latest_handshake) != 0
-            and datetime.now() - connection_time < self.max_time_diff,
-            connection_time,
+            latest_handshake != 0
+            and now - latest_handshake < self.max_time_diff.total_seconds()
         )
 
     def parse(self, data):
         graph = self._init_graph()
-        data = deepcopy(data)
+        # data is not modified, which avoids copying it
         for interface, interface_properties in data.items():
-            peers = interface_properties.pop("peers", [])
-            graph.add_node(interface, **interface_properties)
-            for peer in peers:
-                public_key = (*peer,)[0]
+            graph.add_node(
+                interface,
+                **{
+                    key: value
+                    for key, value in interface_properties.items()
+                    if key != "peers"
+                }
+            )
+            for peer in interface_properties.get("peers", []):
+                public_key = next(iter(peer))
                 peer_properties = peer[public_key]
                 if not peer_properties.get("connected"):
                     continue
@@ -20,25 +20,37 @@ class ZeroTierParser(BaseParser):
                 continue
             # Similar to zerotier-cli peers command (PATH)
             # We only select path that are active, preferred, and not expired
-            for path in peer.get("paths"):
-                if (
-                    not path.get("expired")
-                    and path.get("active")
-                    and path.get("preferred")
-                ):
-                    peer_address = peer.get("address")
-                    peer_properties = dict(
-                        label=peer_address,
-                        address=peer_address,
-                        ip_address=path.pop("address"),
-                        role=peer.get("role"),
-                        version=peer.get("version"),
-                        tunneled=peer.get("tunneled"),
-                        isBonded=peer.get("isBonded"),
-                    )
-                    graph.add_node("controller", label="controller")
-                    graph.add_node(peer_address, **peer_properties)
-                    graph.add_edge(
-                        "controller", peer_address, weight=peer.get("latency"), **path
-                    )
+            paths = [
+                path
+                for path in peer.get("paths")
+                if not path.get("expired")
+                and path.get("active")
+                and path.get("preferred")
+            ]
+            if not paths:
+                continue
+            # the properties of the selected paths are merged (the last one
+            # wins) without modifying data, which can then be parsed again
+            path_properties = {}
+            for path in paths:
+                path_properties.update(path)
+            peer_address = peer.get("address")
+            peer_properties = dict(
+                label=peer_address,
+                address=peer_address,
+                ip_address=path_properties.pop("address"),
+                role=peer.get("role"),
+                version=peer.get("version"),
+                tunneled=peer.get("tunneled"),
+                isBonded=peer.get("isBonded"),
+            )
+            if "controller" not in graph:
+                graph.add_node("controller", label="controller")
+            graph.add_node(peer_address, **peer_properties)
+            graph.add_edge(
+                "controller",
+                peer_address,
+                weight=peer.get("latency"),
+                **path_properties
+            )
         return graph
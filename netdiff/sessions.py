@@ -0,0 +1,60 @@
+_default_session = None
+
+
+def create_session(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=0,
+    backoff_factor=0,
+    headers=None,
+):
+    """
+    Returns a ``requests.Session`` which keeps HTTP connections alive
+    and reuses them for subsequent requests to the same hosts
+
+    :param pool_connections: number of hosts for which a pool is kept
+    :param pool_maxsize: maximum number of connections kept for each host
+    :param max_retries: retries of failed connections and of responses
+                        with status 502, 503 or 504
+    :param backoff_factor: factor used to calculate the sleep time
+                           between retries (see ``urllib3.util.Retry``)
+    :param headers: ``dict`` of headers sent with each request
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    retries = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_default_session():
+    """
+    Returns the session used by parsers which have not
+    been given one explicitly, ``None`` if not set
+    """
+    return _default_session
+
+
+def set_default_session(session):
+    """
+    Sets the session used by parsers which have not been given one
+    explicitly, ``None`` restores the default behavior (no session)
+    """
+    global _default_session
+    _default_session = session
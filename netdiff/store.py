@@ -0,0 +1,183 @@
+import sqlite3
+import time
+
+from . import json_backend
+from .tracker import TopologyTracker
+from .utils import _apply_diff, _edge_key, _netjson_metadata
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    keyframe INTEGER NOT NULL,
+    directed INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS snapshots_timestamp ON snapshots (timestamp);
+"""
+
+
+class SnapshotStore(object):
+    """
+    Stores the history of a topology in a SQLite database: a full
+    NetJSON snapshot (keyframe) is saved every ``keyframe_interval``
+    snapshots, the others are saved as the result of ``diff()``
+    with the previous snapshot, so that the size of the database
+    grows with the changes of the topology rather than with its size
+    """
+
+    def __init__(self, database=":memory:", keyframe_interval=100):
+        """
+        :param database: path of the SQLite database, created if necessary
+        :param keyframe_interval: maximum number of snapshots between
+                                  two keyframes, higher values reduce
+                                  the size of the database and make
+                                  the retrieval of snapshots slower
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be greater than zero")
+        self.keyframe_interval = keyframe_interval
+        self.connection = sqlite3.connect(database)
+        self.connection.executescript(_SCHEMA)
+        self._tracker = TopologyTracker()
+        self._metadata = None
+        self._deltas = 0
+        self._timestamp = self.connection.execute(
+            "SELECT MAX(timestamp) FROM snapshots"
+        ).fetchone()[0]
+
+    def add(self, parser, timestamp=None):
+        """
+        Stores the topology of ``parser`` as the snapshot taken
+        at ``timestamp`` (seconds since the epoch or ``datetime``),
+        which defaults to the current time and can't precede the
+        timestamp of the latest snapshot in the store
+        """
+        timestamp = _to_seconds(timestamp)
+        if self._timestamp is not None and timestamp < self._timestamp:
+            raise ValueError(
+                "timestamp {0} precedes the latest snapshot ({1})".format(
+                    timestamp, self._timestamp
+                )
+            )
+        directed = parser.graph.is_directed()
+        metadata = (parser.protocol, parser.version, parser.revision, parser.metric)
+        result = self._tracker.update(parser)
+        # a keyframe is stored also when the metadata changes,
+        # which is not included in the result of diff()
+        keyframe = (
+            result is None
+            or self._deltas + 1 >= self.keyframe_interval
+            or (metadata, directed) != self._metadata
+        )
+        data = parser.json(dict=True) if keyframe else result
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO snapshots (timestamp, keyframe, directed, data) "
+                "VALUES (?, ?, ?, ?)",
+                (timestamp, keyframe, directed, json_backend.dumps(data)),
+            )
+        self._deltas = 0 if keyframe else self._deltas + 1
+        self._metadata = (metadata, directed)
+        self._timestamp = timestamp
+
+    def get(self, timestamp):
+        """
+        Returns the NetJSON NetworkGraph ``dict`` of the latest snapshot
+        taken at or before ``timestamp``, ``None`` if there is none
+        """
+        row = self.connection.execute(
+            "SELECT id FROM snapshots WHERE timestamp <= ? "
+            "ORDER BY timestamp DESC, id DESC LIMIT 1",
+            (_to_seconds(timestamp),),
+        ).fetchone()
+        if row is None:
+            return None
+        return next(self._replay(row[0], row[0]))[1]
+
+    def range(self, start, end):
+        """
+        Generator which returns a ``(timestamp, NetworkGraph)`` tuple for
+        each snapshot taken between ``start`` and ``end`` (inclusive),
+        in chronological order; the deltas are replayed only once
+        """
+        row = self.connection.execute(
+            "SELECT id FROM snapshots WHERE timestamp >= ? "
+            "ORDER BY timestamp, id LIMIT 1",
+            (_to_seconds(start),),
+        ).fetchone()
+        if row is None:
+            return
+        end = _to_seconds(end)
+        for timestamp, snapshot in self._replay(row[0]):
+            if timestamp > end:
+                return
+            yield timestamp, snapshot
+
+    def _replay(self, first, last=None):
+        """
+        rebuilds the snapshots from ``first`` to ``last`` (IDs)
+        replaying the deltas stored after the preceding keyframe
+        """
+        (keyframe,) = self.connection.execute(
+            "SELECT MAX(id) FROM snapshots WHERE keyframe AND id <= ?", (first,)
+        ).fetchone()
+        query = "SELECT id, timestamp, keyframe, directed, data FROM snapshots "
+        query += "WHERE id >= ?" + (" AND id <= ?" if last is not None else "")
+        parameters = (keyframe,) if last is None else (keyframe, last)
+        graph = None
+        for row_id, timestamp, is_keyframe, directed, data in self.connection.execute(
+            query + " ORDER BY id", parameters
+        ):
+            data = json_backend.loads(data)
+            if is_keyframe:
+                graph = _Snapshot(data, directed)
+            else:
+                graph.apply(data)
+            if row_id >= first:
+                yield timestamp, graph.networkgraph()
+
+    def close(self):
+        self.connection.close()
+
+
+class _Snapshot(object):
+    """
+    NetJSON NetworkGraph indexed by node ID and link key,
+    to which the results of ``diff()`` can be applied
+    """
+
+    def __init__(self, data, directed):
+        self.directed = directed
+        self.metadata = _netjson_metadata(
+            data["protocol"], data["version"], data["revision"], data["metric"]
+        )
+        self.nodes = {node["id"]: node for node in data["nodes"]}
+        self.links = {
+            _edge_key(link["source"], link["target"], directed): link
+            for link in data["links"]
+        }
+
+    def apply(self, diff):
+        _apply_diff(self.nodes, self.links, diff, self.directed)
+
+    def networkgraph(self):
+        """
+        returns a new NetworkGraph ``dict``, the node and link
+        objects are shared with the other rebuilt snapshots
+        """
+        data = self.metadata.copy()
+        data["nodes"] = sorted(self.nodes.values(), key=lambda node: node["id"])
+        data["links"] = sorted(
+            self.links.values(), key=lambda link: (link["source"], link["target"])
+        )
+        return data
+
+
+def _to_seconds(timestamp):
+    if timestamp is None:
+        return time.time()
+    if hasattr(timestamp, "timestamp"):
+        # datetime
+        return timestamp.timestamp()
+    return timestamp
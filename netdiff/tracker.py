@@ -0,0 +1,124 @@
+from .utils import _diff, _diff_result, _is_unchanged, _Tolerances, _TopologyIndex
+
+
+class TopologyTracker(object):
+    """
+    Keeps track of a topology which is retrieved periodically:
+    each snapshot is indexed only once and compared with the previous one
+    """
+
+    def __init__(self, parser_class=None, tolerances=None, ignore=None, **kwargs):
+        """
+        :param parser_class: parser used by ``poll`` to retrieve the topology
+        :param tolerances: differences of attributes which are not reported
+                           as changes (see ``diff``), each snapshot is compared
+                           with the values reported last, so that slow drifts
+                           are reported once they exceed the tolerances
+        :param ignore: attributes whose changes are not reported (see ``diff``)
+        :param kwargs: arguments passed to ``parser_class`` (eg: ``url``)
+        """
+        self.parser_class = parser_class
+        self.kwargs = kwargs
+        self._tolerances = _Tolerances(tolerances, ignore)
+        self.parser = None
+        self._index = None
+
+    def poll(self, **kwargs):
+        """
+        Retrieves a new snapshot of the topology with ``parser_class``
+        and returns its differences from the previous snapshot,
+        keyword arguments override the ones passed to the constructor;
+        if the retrieved data is identical to the previous one,
+        the previous graph is reused without parsing the data again
+        """
+        if self.parser_class is None:
+            raise ValueError("parser_class must be supplied in order to poll")
+        options = dict(self.kwargs, previous=self.parser)
+        options.update(kwargs)
+        return self.update(self.parser_class(**options))
+
+    def update(self, parser):
+        """
+        Stores ``parser`` as the latest snapshot of the topology and returns
+        its differences from the previous snapshot in the format of ``diff``,
+        returns ``None`` if there is no previous snapshot
+        """
+        ignore = self._tolerances.ignore
+        if self.parser is None:
+            index = _TopologyIndex(parser.graph, ignore=ignore)
+            result = None
+        elif _is_unchanged(self.parser, parser):
+            # the graph of the previous snapshot has been reused
+            # or parsed from identical data
+            index = self._index
+            result = _diff_result(None, None, None)
+        else:
+            index = _TopologyIndex(parser.graph, ignore=ignore)
+            result = _diff(self._index, index, parser, self._tolerances)
+        self.parser = parser
+        self._index = index
+        return result
+
+    def reset(self):
+        """
+        Forgets the latest snapshot
+        """
+        self.parser = None
+        self._index = None
+
+
+def diff_series(snapshots, processes=None, tolerances=None, ignore=None):
+    """
+    Generator which returns the differences between each snapshot
+    of a topology and the following one in the format of ``diff``,
+    indexing each snapshot only once
+
+    :param snapshots: iterable of the parsers of the snapshots in
+                      chronological order, which is consumed lazily
+                      (eg: a generator) unless ``processes`` is used
+    :param processes: number of processes among which the snapshots are
+                      distributed, in contiguous chunks; by default
+                      the differences are calculated one at a time
+                      in the calling process, while they are requested
+    :param tolerances: see ``TopologyTracker``, when ``processes`` is used
+                       each chunk starts from the values of its first snapshot
+    :param ignore: see ``TopologyTracker``
+    """
+    if not processes:
+        tracker = TopologyTracker(tolerances=tolerances, ignore=ignore)
+        for parser in snapshots:
+            result = tracker.update(parser)
+            if result is not None:
+                yield result
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    snapshots = [_Snapshot(parser) for parser in snapshots]
+    # one chunk per process, consecutive chunks share
+    # a snapshot, which is therefore indexed twice
+    step = max(-(-(len(snapshots) - 1) // processes), 1)
+    chunks = []
+    for start in range(0, len(snapshots) - 1, step):
+        end = start + step + 1
+        chunks.append((snapshots[start:end], tolerances, ignore))
+    with ProcessPoolExecutor(processes) as pool:
+        for results in pool.map(_diff_chunk, chunks):
+            yield from results
+
+
+def _diff_chunk(arguments):
+    snapshots, tolerances, ignore = arguments
+    return list(diff_series(snapshots, tolerances=tolerances, ignore=ignore))
+
+
+class _Snapshot(object):
+    """
+    attributes of a parser used by ``diff``, sent to other processes
+    instead of the parser (which holds the original data too)
+    """
+
+    __slots__ = ("graph", "protocol", "version", "revision", "metric", "checksum")
+
+    def __init__(self, parser):
+        for attribute in self.__slots__:
+            setattr(self, attribute, getattr(parser, attribute, None))
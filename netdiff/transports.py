@@ -0,0 +1,169 @@
+import threading
+
+from .exceptions import TopologyRetrievalError
+
+try:
+    import urlparse
+except ImportError:  # pragma: no cover
+    from urllib import parse as urlparse  # pragma: no cover
+
+# transport function of each URL scheme, see register_transport
+_transports = {}
+
+
+def register_transport(scheme, function):
+    """
+    Registers the function used by parsers to retrieve the topology
+    data from URLs with ``scheme``, ``None`` removes the transport
+
+    :param scheme: URL scheme (eg: ``ssh``)
+    :param function: callable which receives the parser and the URL
+                     (parsed with ``urllib.parse.urlparse``) and returns
+                     the topology data: ``str``, ``dict`` or file-like
+                     object, which is closed by the parser once parsed;
+                     should raise ``TopologyRetrievalError`` on failure
+    """
+    scheme = scheme.lower()
+    if function is None:
+        _transports.pop(scheme, None)
+    else:
+        _transports[scheme] = function
+
+
+def get_transport(scheme):
+    """
+    Returns the function registered for ``scheme``,
+    raises ``TopologyRetrievalError`` if there is none
+    """
+    try:
+        return _transports[scheme.lower()]
+    except KeyError:
+        raise TopologyRetrievalError(
+            'Unsupported URL scheme "{0}", supported schemes: {1}'.format(
+                scheme, ", ".join(sorted(_transports))
+            )
+        )
+
+
+def http_transport(parser, url):
+    return parser._get_http(url)
+
+
+def telnet_transport(parser, url):
+    return parser._get_telnet(url)
+
+
+def file_transport(parser, url):
+    """
+    ``file:///path/to/topology.json``, the file is read while parsing
+    """
+    try:
+        return _TransportStream(open(urlparse.unquote(url.path), "rb"))
+    except Exception as e:
+        raise TopologyRetrievalError(e)
+
+
+def unix_transport(parser, url):
+    """
+    ``unix:///path/to/socket?request``, connects to a Unix domain socket,
+    sends the request (if any) followed by a newline and reads the reply
+    """
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(parser.timeout)
+    try:
+        sock.connect(urlparse.unquote(url.path))
+        if url.query:
+            sock.sendall(urlparse.unquote(url.query).encode() + b"\n")
+        stream = sock.makefile("rb")
+    except Exception as e:
+        raise TopologyRetrievalError(e)
+    finally:
+        # the connection is closed together with the stream
+        sock.close()
+    return _TransportStream(stream)
+
+
+def exec_transport(parser, url):
+    """
+    ``exec://wg show all dump``, runs a command and reads its output,
+    the command is split with ``shlex.split`` and must exit successfully
+    within the timeout of the parser (if any), otherwise it's killed;
+    not registered by default, since it allows to run any command
+    """
+    import shlex
+    import subprocess
+
+    try:
+        command = shlex.split(urlparse.unquote(url.netloc + url.path))
+        process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    except Exception as e:
+        raise TopologyRetrievalError(e)
+    return _TransportStream(process.stdout, process, parser.timeout)
+
+
+class _TransportStream(object):
+    """
+    Binary stream returned by transports: raises ``TopologyRetrievalError``
+    when reading fails and, for the output of a process, when the process
+    does not exit successfully once its output has been read or when it
+    does not exit before ``timeout`` (in which case it's killed)
+    """
+
+    def __init__(self, stream, process=None, timeout=None):
+        self.stream = stream
+        self.process = process
+        self.timeout = timeout
+        self.timed_out = False
+        self._timer = None
+        if process is not None and timeout is not None:
+            # reading blocks until the process writes or exits,
+            # killing it makes the pending read return
+            self._timer = threading.Timer(timeout, self._kill)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _kill(self):
+        self.timed_out = True
+        self.process.kill()
+
+    def read(self, size=-1):
+        try:
+            data = self.stream.read(size)
+        except OSError as e:
+            raise TopologyRetrievalError(e)
+        if self.process is not None and (
+            self.timed_out or not data or size is None or size < 0
+        ):
+            self._wait()
+        return data
+
+    def _wait(self):
+        status = self.process.wait()
+        if self.timed_out:
+            raise TopologyRetrievalError(
+                "{0!r} timed out after {1} seconds".format(
+                    self.process.args, self.timeout
+                )
+            )
+        if status:
+            raise TopologyRetrievalError(
+                "{0!r} exited with status {1}".format(self.process.args, status)
+            )
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self.stream.close()
+        if self.process is not None:
+            if self.process.poll() is None:
+                self.process.kill()
+            self.process.wait()
+
+
+register_transport("http", http_transport)
+register_transport("https", http_transport)
+register_transport("telnet", telnet_transport)
+register_transport("file", file_transport)
+register_transport("unix", unix_transport)
@@ -1,46 +1,107 @@
-import json
+import codecs
+import math
 from collections import OrderedDict
 
+from . import json_backend
 from .exceptions import NetJsonError
+from .graph import _MISSING, CompactGraph
 
+# names of the attributes of the graph which are named differently in NetJSON
+_ATTRIBUTE_ALIASES = {"cost": "weight"}
+# values of the attributes which are equivalent to their absence
+_ATTRIBUTE_DEFAULTS = {"label": "", "local_addresses": [], "cost_text": ""}
 
-def diff(old, new):
+
+def diff(old, new, tolerances=None, ignore=None):
     """
     Returns differences of two network topologies old and new
     in NetJSON NetworkGraph compatible format
+
+    :param tolerances: ``dict`` which maps attribute names (eg: ``cost``)
+                       to the largest difference of their numeric values
+                       which is not reported as a change, either absolute
+                       (a number) or a ``dict`` with the ``absolute``
+                       and/or ``relative`` keys (see ``math.isclose``)
+    :param ignore: names of the attributes (eg: ``bytes_received``)
+                   whose changes are not reported
+    """
+    if _is_unchanged(old, new):
+        return _diff_result(None, None, None)
+    tolerances = _Tolerances(tolerances, ignore)
+    return _diff(
+        _TopologyIndex(old.graph, ignore=tolerances.ignore),
+        _TopologyIndex(new.graph, ignore=tolerances.ignore),
+        new,
+        tolerances,
+    )
+
+
+def _is_unchanged(old, new):
+    """
+    returns ``True`` if old and new share the same graph or if they
+    have been parsed from identical data by the same parser,
+    which allows to skip the comparison of the topologies
+    """
+    if old.graph is new.graph:
+        return True
+    checksum = getattr(old, "checksum", None)
+    return checksum is not None and checksum == getattr(new, "checksum", None)
+
+
+def _diff_result(added, removed, changed):
+    return OrderedDict((("added", added), ("removed", removed), ("changed", changed)))
+
+
+def _diff(old_index, new_index, new, tolerances=None):
     """
+    Returns differences of two indexed network topologies,
+    the metadata of the output is taken from the parser ``new``;
+    the changes within ``tolerances`` are not reported and the
+    attributes of ``old_index`` are retained by ``new_index``, so that
+    the next comparison is made with the last reported values
+    """
+    if tolerances is None:
+        tolerances = _Tolerances()
     protocol = new.protocol
     version = new.version
     revision = new.revision
     metric = new.metric
+    # links are compared ignoring their direction
+    # unless both graphs are directed
+    index = new_index
+    if old_index.directed != new_index.directed:
+        old_index = old_index.undirected()
+        new_index = new_index.undirected()
+    # identical fingerprints mean that nothing changed
+    if (
+        old_index.nodes == new_index.nodes
+        and old_index.edge_fingerprints == new_index.edge_fingerprints
+    ):
+        return _diff_result(None, None, None)
     # calculate differences
-    nodes_in_both, edges_in_both = _find_unchanged(old.graph, new.graph)
-    added_nodes, added_edges = _make_diff(old.graph, new.graph, edges_in_both)
-    removed_nodes, removed_edges = _make_diff(new.graph, old.graph, edges_in_both)
-    changed_nodes = _find_changed_nodes(old.graph, new.graph, nodes_in_both)
-    changed_edges = _find_changed_edges(old.graph, new.graph, edges_in_both)
+    nodes_in_both, edges_in_both = _find_unchanged(old_index, new_index)
+    added_nodes, added_edges = _make_diff(old_index, new_index)
+    removed_nodes, removed_edges = _make_diff(new_index, old_index)
+    changed_nodes = _find_changed_nodes(old_index, new_index, nodes_in_both, tolerances)
+    changed_edges = _find_changed_edges(old_index, new_index, edges_in_both, tolerances)
+    if index is not new_index:
+        index.retain_undirected(new_index)
     # create netjson objects
     # or assign None if no changes
-    if added_nodes.nodes() or added_edges.edges():
+    if added_nodes or added_edges:
         added = _netjson_networkgraph(
-            protocol,
-            version,
-            revision,
-            metric,
-            added_nodes.nodes(data=True),
-            added_edges.edges(data=True),
-            dict=True,
+            protocol, version, revision, metric, added_nodes, added_edges, dict=True
         )
     else:
         added = None
-    if removed_nodes.nodes() or removed_edges.edges():
+    if removed_nodes or removed_edges:
         removed = _netjson_networkgraph(
             protocol,
             version,
             revision,
             metric,
-            removed_nodes.nodes(data=True),
-            removed_edges.edges(data=True),
+            removed_nodes,
+            removed_edges,
             dict=True,
         )
     else:
@@ -51,122 +112,543 @@ def diff(old, new):
         )
     else:
         changed = None
-    return OrderedDict((("added", added), ("removed", removed), ("changed", changed)))
+    return _diff_result(added, removed, changed)
+
+
+class _TopologyIndex(object):
+    """
+    Indexes the nodes and links of a graph with hashable keys
+    and stores hashable fingerprints of their attributes,
+    which allows to compare two topologies in linear time
+    """
+
+    def __init__(self, graph, directed=None, ignore=frozenset()):
+        if directed is None:
+            directed = graph.is_directed()
+        self.graph = graph
+        self.directed = directed
+        # the ignored attributes are excluded from the fingerprints
+        self.ignore = ignore
+        self.nodes = {
+            node: _node_fingerprint(properties, ignore)
+            for node, properties in graph.nodes(data=True)
+        }
+        # maps the key of each link to a (source, target, properties) tuple
+        self.edges = {}
+        self.edge_fingerprints = {}
+        for src, dst, properties in graph.edges(data=True):
+            key = _edge_key(src, dst, directed)
+            self.edges[key] = (src, dst, properties)
+            self.edge_fingerprints[key] = _edge_fingerprint(
+                src, dst, properties, ignore
+            )
+        # attributes of the nodes retained from a previous index
+        self.retained_nodes = {}
+        # keys of the links whose attributes were retained
+        self.retained_edges = set()
+
+    def undirected(self):
+        """
+        returns an index in which links are identified
+        independently from their direction, which
+        keeps the attributes retained by this index
+        """
+        if not self.directed:
+            return self
+        index = _TopologyIndex(self.graph, directed=False, ignore=self.ignore)
+        index.nodes.update(self.nodes)
+        index.retained_nodes.update(self.retained_nodes)
+        for key in self.retained_edges:
+            src, dst, properties = self.edges[key]
+            undirected_key = _edge_key(src, dst, False)
+            index.edges[undirected_key] = self.edges[key]
+            index.edge_fingerprints[undirected_key] = self.edge_fingerprints[key]
+            index.retained_edges.add(undirected_key)
+        return index
+
+    def retain_undirected(self, index):
+        """
+        retains the attributes retained by ``index``,
+        which has been returned by ``self.undirected()``
+        """
+        for node, attributes in index.retained_nodes.items():
+            self.nodes[node] = index.nodes[node]
+            self.retained_nodes[node] = attributes
+        if not index.retained_edges:
+            return
+        for key, (src, dst, properties) in list(self.edges.items()):
+            undirected_key = _edge_key(src, dst, False)
+            if undirected_key not in index.retained_edges:
+                continue
+            properties = index.edges[undirected_key][2]
+            self.edges[key] = (src, dst, properties)
+            self.edge_fingerprints[key] = _edge_fingerprint(
+                src, dst, properties, self.ignore
+            )
+            self.retained_edges.add(key)
+
+    def node_attributes(self, node):
+        try:
+            return self.retained_nodes[node]
+        except KeyError:
+            return self.graph.nodes[node]
+
+    def retain_node(self, old, node):
+        """
+        replaces the attributes of ``node`` with the ones in ``old``
+        """
+        self.nodes[node] = old.nodes[node]
+        self.retained_nodes[node] = old.node_attributes(node)
+
+    def retain_edge(self, old, key):
+        """
+        replaces the attributes of the link ``key`` with the ones in ``old``
+        """
+        self.edges[key] = old.edges[key]
+        self.edge_fingerprints[key] = old.edge_fingerprints[key]
+        self.retained_edges.add(key)
+
+
+class _Tolerances(object):
+    """
+    Decides whether the differences between the attributes of
+    a node or link in two topologies are significant
+    """
+
+    def __init__(self, tolerances=None, ignore=None):
+        self.ignore = frozenset(
+            _ATTRIBUTE_ALIASES.get(key, key) for key in ignore or ()
+        )
+        # (relative, absolute) threshold of each attribute
+        self.thresholds = {}
+        for key, tolerance in (tolerances or {}).items():
+            if not isinstance(tolerance, dict):
+                tolerance = {"absolute": tolerance}
+            unknown = set(tolerance) - {"absolute", "relative"}
+            if unknown:
+                raise ValueError(
+                    "unknown tolerance of {0!r}: {1}".format(key, sorted(unknown))
+                )
+            self.thresholds[_ATTRIBUTE_ALIASES.get(key, key)] = (
+                tolerance.get("relative", 0.0),
+                tolerance.get("absolute", 0.0),
+            )
+
+    def changed(self, old, new):
+        """
+        returns ``True`` if the attribute dicts ``old`` and ``new``
+        differ by more than the tolerances, the ignored attributes
+        and the ones which are equivalent to their default are skipped
+        """
+        for key in old.keys() | new.keys():
+            if key in self.ignore:
+                continue
+            old_value = _attribute_value(old, key)
+            new_value = _attribute_value(new, key)
+            threshold = self.thresholds.get(key)
+            if threshold and _is_number(old_value) and _is_number(new_value):
+                relative, absolute = threshold
+                if not math.isclose(
+                    old_value, new_value, rel_tol=relative, abs_tol=absolute
+                ):
+                    return True
+            elif _freeze(old_value) != _freeze(new_value):
+                return True
+        return False
+
+    def changed_edge(self, old, new):
+        """
+        same as ``changed`` for ``(source, target, properties)`` tuples,
+        the direction of links is always significant
+        """
+        return old[:2] != new[:2] or self.changed(old[2], new[2])
+
+
+def _attribute_value(attributes, key):
+    """
+    returns the value of an attribute, the default value if the
+    attribute is optional in NetJSON and is missing or ``None``,
+    ``_MISSING`` if any other attribute is missing
+    """
+    value = attributes.get(key, _MISSING)
+    if key in _ATTRIBUTE_DEFAULTS and (value is _MISSING or value is None):
+        return _ATTRIBUTE_DEFAULTS[key]
+    return value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _make_diff(old, new):
+    """
+    calculates differences between indexed topologies 'old' and 'new'
+    returns a tuple with two lists, the first contains the added nodes,
+    the second contains the added links, both include their attributes;
+    the graphs are not copied, the lists reference their attributes
+    """
+    nodes = [
+        (node, properties)
+        for node, properties in new.graph.nodes(data=True)
+        if node not in old.nodes
+    ]
+    edges = [edge for key, edge in new.edges.items() if key not in old.edges]
+    return nodes, edges
 
 
-def _make_diff(old, new, both):
+def _edge_key(src, dst, directed):
     """
-    calculates differences between topologies 'old' and 'new'
-    returns a tuple with two network graph objects
-    the first graph contains the added nodes, the second contains the added links
+    returns a hashable key which identifies a link,
+    on undirected graphs the key does not depend on the direction
     """
-    # make a copy of old topology to avoid tampering with it
-    diff_edges = new.copy()
-    not_different = [tuple(edge) for edge in both]
-    diff_edges.remove_edges_from(not_different)
-    # repeat operation with nodes
-    diff_nodes = new.copy()
-    not_different = []
-    for new_node in new.nodes():
-        if new_node in old.nodes():
-            not_different.append(new_node)
-    diff_nodes.remove_nodes_from(not_different)
-    # return tuple with modified graphs
-    # one for nodes and one for links
-    return diff_nodes, diff_edges
+    if directed:
+        return (src, dst)
+    return frozenset((src, dst))
 
 
 def _find_unchanged(old, new):
     """
     returns nodes and edges that are in both old and new
     """
-    edges = []
-    nodes = []
-    old_edges = [set([src, dst]) for src, dst in old.edges()]
-    new_edges = [set([src, dst]) for src, dst in new.edges()]
-    old_nodes = [node for node in old.nodes()]
-    new_nodes = [node for node in new.nodes()]
-    for old_edge in old_edges:
-        if old_edge in new_edges:
-            edges.append(set(old_edge))
-    for old_node in old_nodes:
-        if old_node in new_nodes:
-            nodes.append(old_node)
+    nodes = {node for node in new.nodes if node in old.nodes}
+    edges = {key for key in new.edges if key in old.edges}
     return nodes, edges
 
 
-def _nodes_difference(graph, both):
-    nodes = []
-    for ip, properties in graph.nodes(data=True):
-        # skip nodes that are not in both
-        if ip not in both:
-            continue
-        props = properties.copy()
-        old_node = [ip]
-        # wrap attributes in tuples so they will be recognizable
-        old_node.append(("label", popdefault(props, "label", "")))
-        old_node.append(("local_addresses", props.pop("local_addresses", [])))
-        for name, value in props.items():
-            old_node.append((name, value))
-        nodes.append(old_node)
-    return nodes
+def _freeze(value):
+    """
+    converts attribute values into hashable objects
+    which can be compared and stored in sets and dicts
+    """
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+def _node_fingerprint(properties, ignore=frozenset()):
+    """
+    returns a hashable representation of the attributes of a node
+    """
+    props = _without(properties, ignore)
+    label = popdefault(props, "label", "")
+    local_addresses = props.pop("local_addresses", [])
+    return label, _freeze(local_addresses), _freeze(props)
 
 
-def _find_changed_nodes(old, new, both):
+def _edge_fingerprint(src, dst, properties, ignore=frozenset()):
     """
-    returns nodes that have changed properties
+    returns a hashable representation of the attributes of a link,
+    the direction in which the link is stored is considered an attribute
     """
-    # create two list of sets of old and new nodes including
-    # label, local_addresses and properties
-    old_nodes = _nodes_difference(old, both)
-    new_nodes = _nodes_difference(new, both)
+    props = _without(properties, ignore)
+    weight = props.pop("weight", None)
+    cost_text = props.pop("cost_text", "")
+    return src, dst, weight, cost_text, _freeze(props)
+
 
-    # find out which node changed
+def _without(properties, ignore):
+    """
+    returns a copy of ``properties`` without the ``ignore`` keys
+    """
+    if not ignore:
+        return properties.copy()
+    return {key: value for key, value in properties.items() if key not in ignore}
+
+
+def _find_changed_nodes(old, new, both, tolerances):
+    """
+    returns nodes that have changed properties beyond ``tolerances``,
+    ``new`` retains the attributes of the other changed nodes
+    """
     changed = []
-    for new_node in new_nodes:
-        if new_node not in old_nodes:
-            props = {}
-            for item in new_node:
-                if isinstance(item, tuple):
-                    props[item[0]] = item[1]
-            changed.append((new_node[0], props))
+    for node, properties in new.graph.nodes(data=True):
+        if node not in both or new.nodes[node] == old.nodes[node]:
+            continue
+        if not tolerances.thresholds or tolerances.changed(
+            old.node_attributes(node), properties
+        ):
+            changed.append((node, properties))
+        else:
+            new.retain_node(old, node)
     return changed
 
 
-def _edges_difference(graph, both):
-    edges = []
-    for src, dst, properties in graph.edges(data=True):
-        # skip edges that are not in both
-        if set((src, dst)) not in both:
+def _find_changed_edges(old, new, both, tolerances):
+    """
+    returns links that have changed any attribute beyond ``tolerances``,
+    ``new`` retains the attributes of the other changed links
+    """
+    changed = []
+    for key in both:
+        if new.edge_fingerprints[key] == old.edge_fingerprints[key]:
             continue
-        props = properties.copy()
-        old_edge = [("_src", src), ("_dst", dst)]
-        old_edge.append(("weight", props.pop("weight")))
-        old_edge.append(("cost_text", props.pop("cost_text", "")))
-        for name, value in props.items():
-            old_edge.append((name, value))
-        edges.append(set(old_edge))
-    return edges
+        if not tolerances.thresholds or tolerances.changed_edge(
+            old.edges[key], new.edges[key]
+        ):
+            changed.append(list(new.edges[key]))
+        else:
+            new.retain_edge(old, key)
+    return changed
 
 
-def _find_changed_edges(old, new, both):
+def _apply_diff(nodes, links, diff, directed):
     """
-    returns links that have changed any attribute
+    applies the result of ``diff()`` to the NetJSON nodes and links
+    of the old topology, indexed respectively by ID and by ``_edge_key``,
+    which are modified in place in order to match the new topology
     """
-    # create two list of sets of old and new edges including
-    # cost, cost_text and properties
-    old_edges = _edges_difference(old, both)
-    new_edges = _edges_difference(new, both)
+    removed = diff["removed"]
+    if removed:
+        for node in removed["nodes"]:
+            nodes.pop(node["id"], None)
+        for link in removed["links"]:
+            links.pop(_edge_key(link["source"], link["target"], directed), None)
+    # changed nodes and links are included with all their attributes
+    for graph in (diff["added"], diff["changed"]):
+        if not graph:
+            continue
+        for node in graph["nodes"]:
+            nodes[node["id"]] = node
+        for link in graph["links"]:
+            links[_edge_key(link["source"], link["target"], directed)] = link
+
+
+def apply_diff(topology, diff):
+    """
+    Applies the output of ``diff(old, new)`` to ``topology``, a parser
+    or graph equal to ``old``, in order to obtain the ``new`` topology
+    without retrieving it; networkx graphs are modified in place, unless
+    they are shared with other parsers (see ``previous``), in which case
+    they are copied first, while ``CompactGraph`` instances (which don't
+    support removing nodes and links) are replaced by a new graph.
+    Returns the resulting graph, which is also assigned to the ``graph``
+    attribute of parsers.
+    """
+    graph = _get_graph(topology)
+    is_parser = graph is not topology
+    if is_parser and topology._graph_shared and not isinstance(graph, CompactGraph):
+        # copy on write, the other parsers keep the original graph
+        graph = graph.copy()
+        topology._graph_shared = False
+    if isinstance(graph, CompactGraph):
+        graph = _rebuild_compact_graph(graph, diff)
+    else:
+        _apply_graph_diff(graph, diff)
+    if is_parser:
+        topology.graph = graph
+        # the graph does not correspond to the parsed data anymore
+        topology.checksum = None
+        metadata = _diff_metadata(diff)
+        if metadata:
+            topology.protocol = metadata["protocol"]
+            topology.version = metadata["version"]
+            topology.revision = metadata["revision"]
+            topology.metric = metadata["metric"]
+    return graph
+
+
+def _get_graph(topology):
+    """
+    returns the graph of a parser, or ``topology`` if it is a graph
+    (networkx graphs have a ``graph`` attribute too)
+    """
+    if hasattr(topology, "is_directed"):
+        return topology
+    return topology.graph
+
+
+def _apply_graph_diff(graph, diff):
+    removed = diff["removed"]
+    if removed:
+        for link in removed["links"]:
+            if graph.has_edge(link["source"], link["target"]):
+                graph.remove_edge(link["source"], link["target"])
+        for node in removed["nodes"]:
+            if node["id"] in graph:
+                graph.remove_node(node["id"])
+    for networkgraph in (diff["added"], diff["changed"]):
+        if not networkgraph:
+            continue
+        for node in networkgraph["nodes"]:
+            if node["id"] in graph:
+                graph.nodes[node["id"]].clear()
+            graph.add_node(node["id"], **_node_attributes(node))
+        for link in networkgraph["links"]:
+            source, target = link["source"], link["target"]
+            if graph.has_edge(source, target):
+                graph.edges[source, target].clear()
+            graph.add_edge(source, target, **_link_attributes(link))
+
+
+def _rebuild_compact_graph(graph, diff):
+    directed = graph.is_directed()
+    nodes = {
+        node: _netjson_node(node, properties)
+        for node, properties in graph.nodes(data=True)
+    }
+    links = {
+        _edge_key(source, target, directed): _netjson_link(source, target, properties)
+        for source, target, properties in graph.edges(data=True)
+    }
+    _apply_diff(nodes, links, diff, directed)
+    new_graph = CompactGraph(directed=directed)
+    for node in nodes.values():
+        new_graph.add_node(node["id"], **_node_attributes(node))
+    for link in links.values():
+        new_graph.add_edge(link["source"], link["target"], **_link_attributes(link))
+    return new_graph
+
+
+def inverse_diff(diff, old):
+    """
+    Returns the output of ``diff(new, old)`` given the output
+    of ``diff(old, new)`` and ``old`` (parser or graph), which is
+    needed to restore the previous attributes of changed nodes and links
+    """
+    graph = _get_graph(old)
+    metadata = _diff_metadata(diff)
+    if metadata and graph is not old:
+        metadata = _netjson_metadata(
+            old.protocol, old.version, old.revision, old.metric
+        )
+    changed_nodes = []
+    changed_links = []
+    if diff["changed"]:
+        changed_nodes = [_original(graph, node) for node in diff["changed"]["nodes"]]
+        changed_links = [_original(graph, link) for link in diff["changed"]["links"]]
+    added = diff["removed"] or {"nodes": [], "links": []}
+    removed = diff["added"] or {"nodes": [], "links": []}
+    return _diff_result(
+        _diff_networkgraph(metadata, added["nodes"], added["links"]),
+        _diff_networkgraph(metadata, removed["nodes"], removed["links"]),
+        _diff_networkgraph(metadata, changed_nodes, changed_links),
+    )
+
+
+def compose_diffs(first, second, directed=False, old=None):
+    """
+    Returns the output of ``diff(a, c)`` given the outputs of
+    ``diff(a, b)`` and ``diff(b, c)``; ``directed`` must be ``True``
+    if the diffs have been calculated between directed graphs.
+
+    The nodes and links changed by ``first`` and removed by ``second``
+    are reported as removed with the attributes they had in ``b``,
+    unless ``old`` (``a``, parser or graph) is passed, which is needed
+    to report them with the attributes they had in ``a`` (eg: in order
+    to pass the result to ``inverse_diff``)
+    """
+    graph = _get_graph(old) if old is not None else None
+
+    def key(item):
+        if "id" in item:
+            return item["id"]
+        return _edge_key(item["source"], item["target"], directed)
+
+    def entries(result, section, kind):
+        return [(key(item), item) for item in (result[section] or {kind: []})[kind]]
+
+    metadata = _diff_metadata(second) or _diff_metadata(first)
+    output = {"added": {}, "removed": {}, "changed": {}}
+    for kind in ("nodes", "links"):
+        # the state of each node and link after the first diff
+        states = {}
+        for section in ("added", "removed", "changed"):
+            for item_key, item in entries(first, section, kind):
+                states[item_key] = (section, item)
+        for section in ("added", "removed", "changed"):
+            for item_key, item in entries(second, section, kind):
+                previous, previous_item = states.get(item_key, (None, None))
+                if previous == "added" and section == "removed":
+                    # neither in a nor in c
+                    del states[item_key]
+                elif previous == "added":
+                    states[item_key] = ("added", item)
+                elif previous == "changed" and section == "removed" and old is not None:
+                    states[item_key] = ("removed", _original(graph, item))
+                elif previous == "removed" and section == "added":
+                    # removed items have the attributes they had in a
+                    if item == previous_item:
+                        del states[item_key]
+                    else:
+                        states[item_key] = ("changed", item)
+                else:
+                    states[item_key] = (section, item)
+        for section, item in states.values():
+            output[section].setdefault(kind, []).append(item)
+    return _diff_result(
+        *[
+            _diff_networkgraph(
+                metadata,
+                output[section].get("nodes", []),
+                output[section].get("links", []),
+            )
+            for section in ("added", "removed", "changed")
+        ]
+    )
+
+
+def _original(graph, item):
+    """
+    returns the NetJSON node or link ``item``
+    with the attributes it has in ``graph``
+    """
+    if "id" in item:
+        return _netjson_node(item["id"], graph.nodes[item["id"]])
+    source, target = item["source"], item["target"]
+    return _netjson_link(source, target, graph.get_edge_data(source, target))
+
+
+def _diff_metadata(diff):
+    """
+    returns the metadata of the first section of ``diff`` which is
+    not ``None``, or ``None`` if the topologies are identical
+    """
+    for networkgraph in diff.values():
+        if networkgraph:
+            return _netjson_metadata(
+                networkgraph["protocol"],
+                networkgraph["version"],
+                networkgraph.get("revision"),
+                networkgraph["metric"],
+            )
+    return None
+
+
+def _diff_networkgraph(metadata, nodes, links):
+    """
+    returns a section of the output of ``diff()``,
+    ``None`` if there are no nodes nor links
+    """
+    if not nodes and not links:
+        return None
+    data = metadata.copy()
+    data["nodes"] = sorted(nodes, key=lambda node: node["id"])
+    data["links"] = sorted(links, key=lambda link: (link["source"], link["target"]))
+    return data
+
+
+def _node_attributes(node):
+    """
+    returns the graph attributes of a NetJSON node
+    """
+    attributes = dict(
+        label=node.get("label"), local_addresses=node.get("local_addresses", [])
+    )
+    attributes.update(node.get("properties", {}))
+    return attributes
 
-    # find out which edge changed
-    changed = []
-    for new_edge in new_edges:
-        if new_edge not in old_edges:
-            props = dict(new_edge)
-            src = props.pop("_src")
-            dst = props.pop("_dst")
-            changed.append([src, dst, props])
-    return changed
+
+def _link_attributes(link):
+    """
+    returns the graph attributes of a NetJSON link
+    """
+    attributes = dict(weight=link["cost"], cost_text=link.get("cost_text", ""))
+    attributes.update(link.get("properties", {}))
+    return attributes
 
 
 def popdefault(dictionary, key, default):
@@ -179,47 +661,129 @@ def popdefault(dictionary, key, default):
     return value or default
 
 
-def _netjson_networkgraph(
-    protocol, version, revision, metric, nodes, links, dict=False, **kwargs
-):
+def _read_chunks(stream, size=65536):
+    """
+    Generator which reads a text or binary stream in chunks of text,
+    the chunks of binary streams are decoded as UTF-8
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        data = stream.read(size)
+        if not data:
+            # raises UnicodeDecodeError if a character is truncated
+            decoder.decode(b"", final=True)
+            return
+        chunk = decoder.decode(data) if isinstance(data, bytes) else data
+        if chunk:
+            yield chunk
+
+
+def _iter_lines(chunks):
+    """
+    Generator which splits chunks of text in lines,
+    line terminators are not included
+    """
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _iter_string_lines(text):
+    """
+    Generator which returns the lines of ``text`` without
+    splitting it all at once, line terminators are not included
+    """
+    start = 0
+    end = text.find("\n")
+    while end != -1:
+        yield text[start:end]
+        start = end + 1
+        end = text.find("\n", start)
+    if start < len(text):
+        yield text[start:]
+
+
+def _netjson_node(ip, properties):
+    netjson_node = OrderedDict({"id": ip})
+    # must copy properties dict to avoid modifying data
+    props = properties.copy()
+    netjson_node["label"] = popdefault(props, "label", "")
+    netjson_node["local_addresses"] = popdefault(props, "local_addresses", [])
+    netjson_node["properties"] = props
+    return netjson_node
+
+
+def _netjson_link(source, target, properties):
+    # must copy properties dict to avoid modifying data
+    props = properties.copy()
+    netjson_link = OrderedDict((("source", source), ("target", target)))
+    netjson_link["cost"] = props.pop("weight")
+    netjson_link["cost_text"] = popdefault(props, "cost_text", "")
+    netjson_link["properties"] = props
+    return netjson_link
+
+
+def _netjson_metadata(protocol, version, revision, metric):
     # netjson format validity check
     if protocol is None:
         raise NetJsonError("protocol cannot be None")
     if version is None and protocol != "static":
         raise NetJsonError('version cannot be None except when protocol is "static"')
-    # prepare nodes
-    node_list = []
-    for ip, properties in nodes:
-        netjson_node = OrderedDict({"id": ip})
-        # must copy properties dict to avoid modifying data
-        props = properties.copy()
-        netjson_node["label"] = popdefault(props, "label", "")
-        netjson_node["local_addresses"] = popdefault(props, "local_addresses", [])
-        netjson_node["properties"] = props
-        node_list.append(netjson_node)
-    node_list.sort(key=lambda d: d["id"])
-    # prepare links
-    link_list = []
-    for source, target, properties in links:
-        # must copy properties dict to avoid modifying data
-        props = properties.copy()
-        netjson_link = OrderedDict((("source", source), ("target", target)))
-        netjson_link["cost"] = props.pop("weight")
-        netjson_link["cost_text"] = popdefault(props, "cost_text", "")
-        netjson_link["properties"] = props
-        link_list.append(netjson_link)
-    link_list.sort(key=lambda d: (d["source"], d["target"]))
-    data = OrderedDict(
+    return OrderedDict(
         (
             ("type", "NetworkGraph"),
             ("protocol", protocol),
             ("version", version),
             ("revision", revision),
             ("metric", metric),
-            ("nodes", node_list),
-            ("links", link_list),
         )
     )
+
+
+def _netjson_networkgraph(
+    protocol, version, revision, metric, nodes, links, dict=False, **kwargs
+):
+    data = _netjson_metadata(protocol, version, revision, metric)
+    # prepare nodes
+    node_list = [_netjson_node(ip, properties) for ip, properties in nodes]
+    node_list.sort(key=lambda d: d["id"])
+    # prepare links
+    link_list = [
+        _netjson_link(source, target, properties)
+        for source, target, properties in links
+    ]
+    link_list.sort(key=lambda d: (d["source"], d["target"]))
+    data["nodes"] = node_list
+    data["links"] = link_list
     if dict:
         return data
-    return json.dumps(data, **kwargs)
+    return json_backend.dumps(data, **kwargs)
+
+
+def _netjson_networkgraph_chunks(protocol, version, revision, metric, nodes, links):
+    """
+    Generator which returns the same NetJSON NetworkGraph of
+    ``_netjson_networkgraph`` in chunks of text, one for each
+    node and link, without building the whole document in memory
+    """
+    data = _netjson_metadata(protocol, version, revision, metric)
+    item_separator, key_separator = json_backend.separators()
+    # only the references to the attributes are sorted, each
+    # node and link is converted right before being encoded
+    nodes = sorted(nodes, key=lambda node: node[0])
+    links = sorted(links, key=lambda link: (link[0], link[1]))
+    # the metadata is encoded without the closing brace
+    yield json_backend.dumps(data)[:-1]
+    yield '{0}"nodes"{1}['.format(item_separator, key_separator)
+    for index, (ip, properties) in enumerate(nodes):
+        chunk = json_backend.dumps(_netjson_node(ip, properties))
+        yield item_separator + chunk if index else chunk
+    yield ']{0}"links"{1}['.format(item_separator, key_separator)
+    for index, (source, target, properties) in enumerate(links):
+        chunk = json_backend.dumps(_netjson_link(source, target, properties))
+        yield item_separator + chunk if index else chunk
+    yield "]}"
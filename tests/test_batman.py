@@ -112,5 +112,18 @@ class TestBatmanParser(TestCase):
 
     def test_get_primary_address_ValueError(self):
         p = BatmanParser(iulinet)
-        r = p._get_primary_address("bb:aa:cc:dd:ee:ff", [["aa:bb:cc:dd:ee:ff"]])
+        primary_addresses = {"aa:bb:cc:dd:ee:ff": "aa:bb:cc:dd:ee:ff"}
+        r = p._get_primary_address("bb:aa:cc:dd:ee:ff", primary_addresses)
         self.assertEqual(r, "bb:aa:cc:dd:ee:ff")
+
+    def test_get_primary_addresses(self):
+        p = BatmanParser(iulinet)
+        data = [
+            {"primary": "a", "secondary": ["b", "c"]},
+            {"primary": "d"},
+            {"primary": "e", "secondary": ["c", "a"]},
+        ]
+        self.assertEqual(
+            p._get_primary_addresses(data),
+            {"a": "a", "b": "a", "c": "a", "d": "d", "e": "e"},
+        )
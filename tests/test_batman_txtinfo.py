@@ -1,3 +1,4 @@
+import io
 import os
 
 import networkx
@@ -20,10 +21,35 @@ class TestBatmanTxtinfoParser(TestCase):
         properties = list(p.graph.edges(data=True))[0][2]
         self.assertIsInstance(properties["weight"], float)
 
+    def test_previous(self):
+        previous = BatmanParser(iulinet)
+        p = BatmanParser(iulinet, previous=previous)
+        self.assertIs(p.original_data, previous.original_data)
+        self.assertEqual(p._format, "txtinfo")
+        graph = p.parse(p.original_data)
+        self.assertEqual(len(graph.edges()), len(previous.graph.edges()))
+
     def test_parse_exception(self):
         with self.assertRaises(ParserError):
             BatmanParser("WRONG")
 
+    def test_parse_exception_row(self):
+        with self.assertRaises(ParserError):
+            BatmanParser("Table: Topology\nheader\na0:f3:c1:ac:6c:44 wrong\n")
+
+    def test_parse_stream(self):
+        for data in [iulinet, iulinet2]:
+            expected = BatmanParser(data).json()
+            self.assertEqual(BatmanParser(io.BytesIO(data.encode())).json(), expected)
+            self.assertEqual(BatmanParser(io.StringIO(data)).json(), expected)
+        with self.assertRaises(ParserError):
+            BatmanParser(io.StringIO("WRONG"))
+
+    def test_parse_stream_alfred_vis(self):
+        data = open("{0}/static/batman.json".format(CURRENT_DIR)).read()
+        p = BatmanParser(io.StringIO(data))
+        self.assertEqual(p.json(), BatmanParser(data).json())
+
     def test_json_dict(self):
         p = BatmanParser(iulinet)
         data = p.json(dict=True)
@@ -0,0 +1,55 @@
+import os
+
+import responses
+
+from netdiff import NetJsonParser, OlsrParser, collect
+from netdiff.exceptions import ParserError, TopologyRetrievalError
+from netdiff.tests import TestCase
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+olsr_path = "{0}/static/olsr-2-links.json".format(CURRENT_DIR)
+netjson_path = "{0}/static/netjson-2-links.json".format(CURRENT_DIR)
+olsr = open(olsr_path).read()
+
+
+class TestCollect(TestCase):
+    def _add_responses(self):
+        responses.add(responses.GET, "http://10.0.0.1:9090", body=olsr)
+        responses.add(
+            responses.GET, "http://10.0.0.2:9090", body="not found", status=404
+        )
+        responses.add(responses.GET, "http://10.0.0.3:9090", body='{"test": 1}')
+
+    def _assert_results(self, results):
+        self.assertEqual(len(results), 5)
+        self.assertIsInstance(results[0], OlsrParser)
+        self.assertEqual(len(results[0].graph.edges()), 2)
+        self.assertIsInstance(results[1], TopologyRetrievalError)
+        self.assertIsInstance(results[2], ParserError)
+        self.assertIsInstance(results[3], NetJsonParser)
+        self.assertTrue(results[3].graph.is_directed())
+        self.assertIsInstance(results[4], OlsrParser)
+
+    def _sources(self):
+        return [
+            (OlsrParser, "http://10.0.0.1:9090"),
+            (OlsrParser, "http://10.0.0.2:9090"),
+            (OlsrParser, {"url": "http://10.0.0.3:9090"}),
+            (NetJsonParser, {"file": netjson_path, "directed": True}),
+            (OlsrParser, {"data": olsr}),
+        ]
+
+    @responses.activate
+    def test_collect(self):
+        self._add_responses()
+        results = collect(self._sources(), max_workers=4, timeout=5)
+        self._assert_results(results)
+
+    @responses.activate
+    def test_collect_processes(self):
+        self._add_responses()
+        results = collect(self._sources(), max_workers=4, processes=2, timeout=5)
+        self._assert_results(results)
+
+    def test_collect_empty(self):
+        self.assertEqual(collect([]), [])
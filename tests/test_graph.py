@@ -0,0 +1,165 @@
+import os
+import pickle
+import unittest
+
+import networkx
+
+from netdiff import CompactGraph, NetJsonParser, OlsrParser, diff
+from netdiff.graph import _Column, intern
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+links2 = open("{0}/static/netjson-2-links.json".format(CURRENT_DIR)).read()
+links3 = open("{0}/static/netjson-3-links.json".format(CURRENT_DIR)).read()
+olsr_links5 = open("{0}/static/olsr-5-links.txt".format(CURRENT_DIR)).read()
+
+
+class TestCompactGraph(unittest.TestCase):
+    def test_nodes(self):
+        graph = CompactGraph()
+        graph.add_node("a", label="A")
+        graph.add_node("b", local_addresses=["10.0.0.1"])
+        graph.add_node("a", hostname="a.mesh")
+        self.assertIn("a", graph)
+        self.assertNotIn("c", graph)
+        self.assertNotIn(["unhashable"], graph)
+        self.assertEqual(len(graph), 2)
+        self.assertEqual(graph.number_of_nodes(), 2)
+        self.assertEqual(list(graph.nodes()), ["a", "b"])
+        self.assertEqual(
+            list(graph.nodes(data=True)),
+            [
+                ("a", {"label": "A", "hostname": "a.mesh"}),
+                ("b", {"local_addresses": ["10.0.0.1"]}),
+            ],
+        )
+        self.assertEqual(graph.nodes["a"], {"label": "A", "hostname": "a.mesh"})
+        self.assertEqual(len(graph.nodes), 2)
+        self.assertIn("b", graph.nodes)
+        with self.assertRaises(KeyError):
+            graph.nodes["c"]
+
+    def test_edges(self):
+        graph = CompactGraph()
+        graph.add_edge("a", "b", weight=1.0)
+        graph.add_edge("c", "a", weight=2.0)
+        graph.add_edge("b", "a", weight=3.0, cost_text="3")
+        self.assertFalse(graph.is_directed())
+        self.assertEqual(graph.number_of_edges(), 2)
+        self.assertTrue(graph.has_edge("a", "c"))
+        self.assertFalse(graph.has_edge("b", "c"))
+        self.assertFalse(graph.has_edge("b", "d"))
+        # same direction reported by networkx
+        self.assertEqual(
+            list(graph.edges(data=True)),
+            [
+                ("a", "b", {"weight": 3.0, "cost_text": "3"}),
+                ("a", "c", {"weight": 2.0}),
+            ],
+        )
+        self.assertEqual(graph.get_edge_data("c", "a"), {"weight": 2.0})
+        self.assertIsNone(graph.get_edge_data("b", "c"))
+        self.assertEqual(graph.get_edge_data("b", "d", {}), {})
+
+    def test_directed_edges(self):
+        graph = CompactGraph(directed=True)
+        graph.add_edge("a", "b", weight=1.0)
+        graph.add_edge("b", "a", weight=2.0)
+        self.assertTrue(graph.is_directed())
+        self.assertEqual(list(graph.edges()), [("a", "b"), ("b", "a")])
+        self.assertTrue(graph.has_edge("b", "a"))
+
+    def test_column(self):
+        column = _Column()
+        column.set(0, 1.0)
+        column.set(1, 2.0)
+        self.assertEqual(column.values.typecode, "d")
+        column.set(0, 3.0)
+        self.assertEqual(column.values.typecode, "d")
+        # values which are not floats are stored in a list
+        column.set(2, 1)
+        self.assertEqual(column.values, [3.0, 2.0, 1])
+        self.assertIs(type(column.get(2)), int)
+        # as are columns with missing values
+        column = _Column()
+        column.set(2, 1.0)
+        self.assertIsInstance(column.values, list)
+        self.assertEqual(column.get(2), 1.0)
+        self.assertIsNot(column.get(0), None)
+
+    def test_to_networkx(self):
+        for directed in [False, True]:
+            p = NetJsonParser(links3, directed=directed)
+            compact = NetJsonParser(links3, directed=directed, compact=True)
+            graph = compact.graph.to_networkx()
+            self.assertEqual(graph.is_directed(), directed)
+            self.assertTrue(networkx.utils.graphs_equal(graph, p.graph))
+            self.assertEqual(list(graph.edges()), list(p.graph.edges()))
+
+    def test_parser(self):
+        p = OlsrParser(olsr_links5, compact=True)
+        self.assertIsInstance(p.graph, CompactGraph)
+        self.assertEqual(p.json(), OlsrParser(olsr_links5).json())
+        self.assertNotEqual(p.checksum, OlsrParser(olsr_links5).checksum)
+
+    def test_diff(self):
+        old = NetJsonParser(links2, compact=True)
+        new = NetJsonParser(links3, compact=True)
+        self.assertEqual(diff(old, new), diff(NetJsonParser(links2), new))
+        self.assertEqual(
+            diff(old, new), diff(NetJsonParser(links2), NetJsonParser(links3))
+        )
+        self.assertIsNone(diff(old, NetJsonParser(links2))["changed"])
+
+    def test_pickle(self):
+        graph = NetJsonParser(links3, compact=True).graph
+        copy = pickle.loads(pickle.dumps(graph))
+        self.assertEqual(list(copy.nodes(data=True)), list(graph.nodes(data=True)))
+        self.assertEqual(list(copy.edges(data=True)), list(graph.edges(data=True)))
+
+
+class TestInterning(unittest.TestCase):
+    def _copy(self, value):
+        # returns a string equal to value which is a different object
+        return "".join(list(value))
+
+    def test_intern(self):
+        value = self._copy("10.0.0.1")
+        self.assertIs(intern(value), intern(self._copy(value)))
+        self.assertEqual(intern(1), 1)
+
+    def test_parsers(self):
+        for compact in [False, True]:
+            old = OlsrParser(self._copy(olsr_links5), compact=compact)
+            new = OlsrParser(self._copy(olsr_links5), compact=compact)
+            for (old_node, old_props), (new_node, new_props) in zip(
+                sorted(old.graph.nodes(data=True)), sorted(new.graph.nodes(data=True))
+            ):
+                self.assertIs(old_node, new_node)
+                for old_key, new_key in zip(old_props, new_props):
+                    self.assertIs(old_key, new_key)
+            for old_edge, new_edge in zip(
+                sorted(old.graph.edges(data=True)), sorted(new.graph.edges(data=True))
+            ):
+                self.assertIs(old_edge[0], new_edge[0])
+                self.assertIs(old_edge[1], new_edge[1])
+                for old_key, new_key in zip(old_edge[2], new_edge[2]):
+                    self.assertIs(old_key, new_key)
+
+    def test_netjson_node_ids(self):
+        old = NetJsonParser(self._copy(links3))
+        new = NetJsonParser(self._copy(links3))
+        for old_node, new_node in zip(sorted(old.graph), sorted(new.graph)):
+            self.assertIs(old_node, new_node)
+        for old_edge, new_edge in zip(
+            sorted(old.graph.edges()), sorted(new.graph.edges())
+        ):
+            self.assertIs(old_edge[0], new_edge[0])
+            self.assertIs(old_edge[1], new_edge[1])
+
+    def test_networkx_graph(self):
+        for directed in [False, True]:
+            graph = OlsrParser(olsr_links5, directed=directed).graph
+            self.assertIsInstance(graph, networkx.Graph)
+            self.assertEqual(graph.is_directed(), directed)
+            copy = pickle.loads(pickle.dumps(graph))
+            self.assertTrue(networkx.utils.graphs_equal(copy, graph))
@@ -0,0 +1,89 @@
+import json
+import os
+import unittest
+
+from netdiff import NetJsonParser, SnapshotStore, json_backend, set_json_backend
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+links2 = open("{0}/static/netjson-2-links.json".format(CURRENT_DIR)).read()
+
+
+class TestJsonBackend(unittest.TestCase):
+    def tearDown(self):
+        set_json_backend(None)
+
+    def test_automatic_selection(self):
+        name = json_backend.get_json_backend()
+        self.assertIn(name, json_backend.BACKENDS)
+        self.assertEqual(json_backend.loads(links2), json.loads(links2))
+
+    def test_output_unchanged(self):
+        expected = NetJsonParser(links2).json()
+        for name in ["json", None]:
+            set_json_backend(name)
+            self.assertEqual(NetJsonParser(links2).json(), expected)
+
+    def test_stdlib_backend(self):
+        set_json_backend("json")
+        self.assertEqual(json_backend.get_json_backend(), "json")
+        self.assertEqual(json_backend.loads('{"a": [1, 2]}'), {"a": [1, 2]})
+        with self.assertRaises(ValueError):
+            json_backend.loads("wrong")
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            set_json_backend("wrong")
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson_loads_fallback(self):
+        set_json_backend("orjson")
+        self.assertEqual(json_backend.get_json_backend(), "orjson")
+        data = json_backend.loads('{"cost": Infinity}')
+        self.assertEqual(data, {"cost": float("inf")})
+        with self.assertRaises(ValueError):
+            json_backend.loads("wrong")
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson_dumps(self):
+        set_json_backend("orjson")
+        p = NetJsonParser(links2)
+        data = p.json(dict=True)
+        expected = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        self.assertEqual(p.json(), expected)
+        # formatting arguments are handled by the standard library
+        self.assertEqual(p.json(indent=4), json.dumps(data, indent=4))
+        # non string keys are not supported by orjson
+        self.assertEqual(json_backend.dumps({1: "a"}), '{"1": "a"}')
+        self.assertEqual("".join(p.json_chunks()), p.json())
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson_dumps_non_finite(self):
+        set_json_backend("orjson")
+        data = json.loads(links2)
+        data["links"][0]["cost"] = float("inf")
+        data["links"][1]["properties"] = {"jitter": float("nan"), "note": None}
+        p = NetJsonParser(data)
+        expected = json.dumps(
+            p.json(dict=True), separators=(",", ":"), ensure_ascii=False
+        )
+        self.assertIn('"cost":Infinity', expected)
+        self.assertEqual(p.json(), expected)
+        self.assertEqual("".join(p.json_chunks()), expected)
+        # None values are still encoded by orjson
+        self.assertEqual(json_backend.dumps({"revision": None}), '{"revision":null}')
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson_store_non_finite(self):
+        set_json_backend("orjson")
+        data = json.loads(links2)
+        store = SnapshotStore()
+        store.add(NetJsonParser(data), 10)
+        data["links"][0]["cost"] = float("inf")
+        store.add(NetJsonParser(data), 20)
+        costs = [link["cost"] for link in store.get(20)["links"]]
+        self.assertIn(float("inf"), costs)
@@ -1,9 +1,12 @@
+import io
+import json
 import os
+from unittest import mock
 
 import networkx
 
 from netdiff import NetJsonParser, diff
-from netdiff.exceptions import ParserError
+from netdiff.exceptions import ConversionException, ParserError
 from netdiff.tests import TestCase
 
 CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
@@ -206,6 +209,67 @@ class TestNetJsonParser(TestCase):
                 }
             )
 
+    def test_parse_stream(self):
+        for data in [links2, links3, nodes1, nodes2]:
+            expected = NetJsonParser(data).json()
+            # small chunks split values, numbers and multi-byte characters
+            for chunk_size in [1, 7, 65536]:
+                with mock.patch("netdiff.parsers.netjson.CHUNK_SIZE", chunk_size):
+                    p = NetJsonParser(io.BytesIO(data.encode()))
+                    self.assertEqual(p.json(), expected)
+                    p = NetJsonParser(io.StringIO(data))
+                    self.assertEqual(p.json(), expected)
+            self.assertIsNone(p.checksum)
+
+    def test_parse_stream_directed(self):
+        p = NetJsonParser(io.StringIO(links2), directed=True)
+        self.assertIsInstance(p.graph, networkx.DiGraph)
+        self.assertEqual(p.json(), NetJsonParser(links2, directed=True).json())
+
+    def test_parse_stream_links_before_nodes(self):
+        data = {
+            "links": [{"source": "10.0.0.1", "target": "10.0.0.2", "cost": 1}],
+            "metric": "ETX",
+            "version": "0.6.6",
+            "protocol": "OLSR",
+            "nodes": [{"id": "10.0.0.1", "label": "A"}, {"id": "10.0.0.2"}],
+            "type": "NetworkGraph",
+        }
+        p = NetJsonParser(io.StringIO(json.dumps(data)))
+        self.assertEqual(p.json(), NetJsonParser(data).json())
+
+    def test_parse_stream_exceptions(self):
+        with self.assertRaises(ParserError):
+            NetJsonParser(io.StringIO('{"type": "WRONG", "nodes": [{}]}'))
+        with self.assertRaises(ParserError):
+            NetJsonParser(io.StringIO('{"type": "NetworkGraph", "nodes": []}'))
+        with self.assertRaises(ParserError):
+            NetJsonParser(io.StringIO('{"links": [{"wrong": "10.150.0.3"}]}'))
+        for data in ["", "[]", '{"type": "NetworkGraph"', '{"nodes": [{"id": 1}']:
+            with self.assertRaises(ConversionException):
+                NetJsonParser(io.StringIO(data))
+
+    def test_parse_stream_truncated_tokens(self):
+        data = json.loads(links2)
+        data["nodes"][0]["properties"] = {
+            "values": [True, False, None, -1.5e-3, float("-inf"), float("nan")],
+            "name": 'caf\u00e9 \\ "x"',
+        }
+        expected = NetJsonParser(data).json()
+        for chunk_size in [1, 3]:
+            with mock.patch("netdiff.parsers.netjson.CHUNK_SIZE", chunk_size):
+                p = NetJsonParser(io.StringIO(json.dumps(data, ensure_ascii=True)))
+                self.assertEqual(p.json(), expected)
+
+    def test_parse_stream_early_syntax_error(self):
+        links = ", ".join(['{"source": "a", "target": "b", "cost": 1}'] * 100000)
+        data = '{"type": NetworkGraph, "links": [' + links + "]}"
+        stream = io.StringIO(data)
+        with self.assertRaises(ConversionException):
+            NetJsonParser(stream)
+        # the rest of the stream is not read
+        self.assertLess(stream.tell(), len(data) / 10)
+
     def test_json_dict(self):
         p = NetJsonParser(links2)
         data = p.json(dict=True)
@@ -253,6 +317,19 @@ class TestNetJsonParser(TestCase):
         self.assertIn("links", data)
         self.assertIn("nodes", data)
 
+    def test_json_stream(self):
+        for data in [links2, links3, nodes1]:
+            p = NetJsonParser(data)
+            fp = io.StringIO()
+            p.json_stream(fp)
+            self.assertEqual(fp.getvalue(), p.json())
+            self.assertEqual("".join(p.json_chunks()), p.json())
+
+    def test_json_stream_empty_graph(self):
+        p = NetJsonParser(links2)
+        p.graph = networkx.Graph()
+        self.assertEqual("".join(p.json_chunks()), p.json())
+
     def test_no_changes(self):
         old = NetJsonParser(links2)
         new = NetJsonParser(links2)
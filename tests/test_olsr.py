@@ -1,3 +1,4 @@
+import io
 import os
 
 import networkx
@@ -9,6 +10,8 @@ from netdiff.tests import TestCase
 
 CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
 links2 = open("{0}/static/olsr-2-links.json".format(CURRENT_DIR)).read()
+bmx6 = open("{0}/static/bmx6.json".format(CURRENT_DIR)).read()
+zt_peers = open("{0}/static/zt-peers.json".format(CURRENT_DIR)).read()
 links2_newformat = open(
     "{0}/static/olsr-2-links-newformat.json".format(CURRENT_DIR)
 ).read()
@@ -43,6 +46,11 @@ class TestOlsrParser(TestCase):
         properties = list(p.graph.nodes(data=True))[0][1]
         self.assertIsInstance(properties["local_addresses"], list)
 
+    def test_parse_stream(self):
+        p = OlsrParser(io.BytesIO(b"\n  " + links5.encode()))
+        self.assertEqual(p.original_data, OlsrParser(links5).original_data)
+        self.assertEqual(p.json(), OlsrParser(links5).json())
+
     def test_init(self):
         p = OlsrParser(links3, version="0.6.3", metric="ETC")
         self.assertEqual(p.version, "0.6.3")
@@ -59,6 +67,11 @@ class TestOlsrParser(TestCase):
         with self.assertRaises(ParserError):
             OlsrParser('{ "topology": [{ "a": "a" }], "mid": [] }')
 
+    def test_parse_exception_not_object(self):
+        for data in ["[1, 2]", "null", bmx6, zt_peers]:
+            with self.assertRaises(ParserError):
+                OlsrParser(data)
+
     def test_parse_exception_mid(self):
         with self.assertRaises(ParserError):
             OlsrParser('{ "topology": [], "missing_mid": [] }')
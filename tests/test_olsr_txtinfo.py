@@ -1,3 +1,4 @@
+import io
 import os
 
 import networkx
@@ -38,6 +39,48 @@ class TestOlsrTxtinfoParser(TestCase):
         with self.assertRaises(ParserError):
             OlsrParser("Table: Topology\n\n\nMISSING MID")
 
+    def test_parse_exception_row(self):
+        with self.assertRaises(ParserError):
+            OlsrParser("Table: Topology\nheader\n10.150.0.3\twrong\n\n")
+
+    def test_original_data(self):
+        p = OlsrParser(links5)
+        self.assertEqual(p.original_data, links5)
+
+    def test_parse_stream(self):
+        for data in [links2, links3, links5]:
+            expected = OlsrParser(data).graph
+            p = OlsrParser(io.BytesIO(data.encode()))
+            self.assertTrue(networkx.utils.graphs_equal(p.graph, expected))
+            p = OlsrParser(io.StringIO(data))
+            self.assertTrue(networkx.utils.graphs_equal(p.graph, expected))
+        with self.assertRaises(ParserError):
+            OlsrParser(io.StringIO("Table: Topology\n\n\nMISSING MID"))
+
+    def test_parse_aliases(self):
+        data = """Table: Topology
+Dest. IP\tLast hop IP\tLQ\tNLQ\tCost
+10.150.0.3\t10.150.0.2\t0.195\t0.184\t1.000
+10.150.0.5\t10.150.0.4\t0.195\t0.184\tINFINITE
+
+Table: MID
+IP address\tAliases
+10.150.0.2\t172.16.0.2;172.17.0.2
+10.150.0.4\t172.16.0.4
+10.150.0.6\t172.16.0.6
+
+"""
+        for p in [OlsrParser(data), OlsrParser(io.StringIO(data))]:
+            self.assertEqual(
+                dict(p.graph.nodes(data="local_addresses")),
+                {
+                    "10.150.0.2": ["172.16.0.2", "172.17.0.2"],
+                    "10.150.0.3": None,
+                    "10.150.0.4": ["172.16.0.4"],
+                },
+            )
+            self.assertEqual(len(p.graph.edges()), 1)
+
     def test_json_dict(self):
         p = OlsrParser(links2)
         data = p.json(dict=True)
@@ -12,6 +12,9 @@ links2undef = open("{0}/static/openvpn-2-links-undef.txt".format(CURRENT_DIR)).r
 links5_tap = open("{0}/static/openvpn-5-links-tap.txt".format(CURRENT_DIR)).read()
 bug = open("{0}/static/openvpn-bug.txt".format(CURRENT_DIR)).read()
 special_case = open("{0}/static/openvpn-special-case.txt".format(CURRENT_DIR)).read()
+local_addresses = open(
+    "{0}/static/openvpn-duplicate-cn-local-addresses.txt".format(CURRENT_DIR)
+).read()
 
 
 class TestOpenvpnParser(TestCase):
@@ -218,6 +221,37 @@ class TestOpenvpnParser(TestCase):
         }
         self.assertEqual(expected, set(targets))
 
+    def test_local_addresses_duplicate_cn(self):
+        """
+        Several clients behind the same real address must
+        get only the virtual addresses routed to their own port
+        """
+        p = OpenvpnParser(local_addresses, duplicate_cn=True)
+        data = p.json(dict=True)
+        nodes = {node["id"]: node["local_addresses"] for node in data["nodes"]}
+        self.assertEqual(
+            nodes,
+            {
+                "openvpn-server": [],
+                "60c5a8fffe77607a,194.183.10.51:49794": [
+                    "172.29.0.42",
+                    "10.10.0.0/24",
+                ],
+                "60c5a8fffe77607a,194.183.10.51:60003": ["172.29.0.34"],
+                "60c5a8fffe77607a,194.183.10.51:41234": [],
+                "58a0cbeffe0156b0,194.183.10.51": ["172.29.0.22"],
+            },
+        )
+        links = {(link["source"], link["target"]) for link in data["links"]}
+        self.assertEqual(
+            links,
+            {
+                ("openvpn-server", "60c5a8fffe77607a,194.183.10.51:49794"),
+                ("openvpn-server", "60c5a8fffe77607a,194.183.10.51:60003"),
+                ("openvpn-server", "58a0cbeffe0156b0,194.183.10.51"),
+            },
+        )
+
     def test_common_name_as_id(self):
         old = OpenvpnParser({})
         new = OpenvpnParser(links5_tap)
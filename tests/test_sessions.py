@@ -0,0 +1,70 @@
+import os
+import unittest
+from unittest import mock
+
+import requests
+import responses
+
+from netdiff import create_session, set_default_session
+from netdiff.exceptions import TopologyRetrievalError
+from netdiff.parsers.base import BaseParser
+from netdiff.sessions import get_default_session
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+links2 = open("{0}/static/olsr-2-links.json".format(CURRENT_DIR)).read()
+
+
+class TestSessions(unittest.TestCase):
+    def tearDown(self):
+        set_default_session(None)
+
+    def test_create_session(self):
+        session = create_session(
+            pool_connections=5,
+            pool_maxsize=20,
+            max_retries=3,
+            backoff_factor=0.5,
+            headers={"User-Agent": "netdiff"},
+        )
+        self.assertIsInstance(session, requests.Session)
+        self.assertEqual(session.headers["User-Agent"], "netdiff")
+        for prefix in ["http://", "https://"]:
+            adapter = session.get_adapter(prefix)
+            self.assertEqual(adapter._pool_connections, 5)
+            self.assertEqual(adapter._pool_maxsize, 20)
+            self.assertEqual(adapter.max_retries.total, 3)
+            self.assertEqual(adapter.max_retries.backoff_factor, 0.5)
+
+    @responses.activate
+    def test_session_argument(self):
+        responses.add(responses.GET, "http://localhost:9090", body=links2)
+        session = create_session()
+        with mock.patch.object(session, "get", wraps=session.get) as get:
+            p = BaseParser(url="http://localhost:9090", session=session)
+            BaseParser(url="http://localhost:9090", session=session)
+        self.assertEqual(get.call_count, 2)
+        self.assertIs(p.session, session)
+        self.assertIsInstance(p.original_data, dict)
+
+    @responses.activate
+    def test_default_session(self):
+        responses.add(responses.GET, "http://localhost:9090", body=links2)
+        session = create_session()
+        set_default_session(session)
+        self.assertIs(get_default_session(), session)
+        with mock.patch.object(session, "get", wraps=session.get) as get:
+            BaseParser(url="http://localhost:9090")
+        get.assert_called_once()
+        # the argument has precedence over the default session
+        other = create_session()
+        with mock.patch.object(other, "get", wraps=other.get) as other_get:
+            with mock.patch.object(session, "get", wraps=session.get) as get:
+                BaseParser(url="http://localhost:9090", session=other)
+        other_get.assert_called_once()
+        get.assert_not_called()
+
+    @responses.activate
+    def test_session_http_error(self):
+        responses.add(responses.GET, "http://404.com", body="not found", status=404)
+        with self.assertRaises(TopologyRetrievalError):
+            BaseParser(url="http://404.com", session=create_session())
@@ -0,0 +1,96 @@
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from netdiff import OlsrParser, SnapshotStore
+from netdiff.tests import TestCase
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+# the txtinfo files have the same metadata
+links2 = open("{0}/static/olsr-2-links.txt".format(CURRENT_DIR)).read()
+links2_cost = open(
+    "{0}/static/olsr-2-links-cost-changed.txt".format(CURRENT_DIR)
+).read()
+links3 = open("{0}/static/olsr-3-links.txt".format(CURRENT_DIR)).read()
+links5 = open("{0}/static/olsr-5-links.txt".format(CURRENT_DIR)).read()
+
+
+class TestSnapshotStore(TestCase):
+    def _fill(self, store):
+        parsers = [
+            OlsrParser(data)
+            for data in [links2, links3, links5, links2_cost, links2_cost, links3]
+        ]
+        for timestamp, parser in enumerate(parsers, start=1):
+            store.add(parser, timestamp * 10)
+        return parsers
+
+    def _netjson(self, parser):
+        return json.loads(parser.json())
+
+    def _keyframes(self, store):
+        query = "SELECT keyframe FROM snapshots ORDER BY id"
+        return [row[0] for row in store.connection.execute(query)]
+
+    def test_get(self):
+        store = SnapshotStore(keyframe_interval=4)
+        parsers = self._fill(store)
+        self.assertEqual(self._keyframes(store), [1, 0, 0, 0, 1, 0])
+        for timestamp, parser in enumerate(parsers, start=1):
+            self.assertEqual(store.get(timestamp * 10), self._netjson(parser))
+            # snapshot taken before the requested time
+            self.assertEqual(store.get(timestamp * 10 + 5), self._netjson(parser))
+        self.assertIsNone(store.get(5))
+
+    def test_range(self):
+        store = SnapshotStore(keyframe_interval=2)
+        parsers = self._fill(store)
+        result = list(store.range(25, 50))
+        self.assertEqual([timestamp for timestamp, snapshot in result], [30, 40, 50])
+        self.assertEqual(
+            [snapshot for timestamp, snapshot in result],
+            [self._netjson(parser) for parser in parsers[2:5]],
+        )
+        self.assertEqual(list(store.range(70, 80)), [])
+
+    def test_datetime(self):
+        store = SnapshotStore()
+        parser = OlsrParser(links2)
+        time = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        store.add(parser, time)
+        self.assertEqual(store.get(time), self._netjson(parser))
+        self.assertEqual(store.get(time.timestamp()), self._netjson(parser))
+
+    def test_timestamp_order(self):
+        store = SnapshotStore()
+        store.add(OlsrParser(links2), 20)
+        with self.assertRaises(ValueError):
+            store.add(OlsrParser(links3), 10)
+
+    def test_keyframe_interval(self):
+        with self.assertRaises(ValueError):
+            SnapshotStore(keyframe_interval=0)
+
+    def test_metadata_changed(self):
+        store = SnapshotStore()
+        store.add(OlsrParser(links2), 10)
+        store.add(OlsrParser(links2, version="0.7"), 20)
+        store.add(OlsrParser(links3, version="0.7"), 30)
+        self.assertEqual(self._keyframes(store), [1, 1, 0])
+        self.assertEqual(store.get(20)["version"], "0.7")
+
+    def test_reopen(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.sqlite")
+            store = SnapshotStore(path)
+            store.add(OlsrParser(links2), 10)
+            store.add(OlsrParser(links3), 20)
+            store.close()
+            store = SnapshotStore(path)
+            with self.assertRaises(ValueError):
+                store.add(OlsrParser(links5), 15)
+            store.add(OlsrParser(links5), 30)
+            self.assertEqual(self._keyframes(store), [1, 0, 1])
+            self.assertEqual(store.get(20), self._netjson(OlsrParser(links3)))
+            store.close()
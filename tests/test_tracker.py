@@ -0,0 +1,102 @@
+import os
+from unittest import mock
+
+from netdiff import OlsrParser, TopologyTracker, diff, diff_series
+from netdiff.tests import TestCase
+from netdiff.utils import _TopologyIndex
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+links2 = open("{0}/static/olsr-2-links.json".format(CURRENT_DIR)).read()
+links3 = open("{0}/static/olsr-3-links.json".format(CURRENT_DIR)).read()
+links5 = open("{0}/static/olsr-5-links.json".format(CURRENT_DIR)).read()
+
+
+class TestTopologyTracker(TestCase):
+    def test_update(self):
+        tracker = TopologyTracker()
+        old = OlsrParser(links2)
+        new = OlsrParser(links3)
+        self.assertIsNone(tracker.update(old))
+        self.assertIs(tracker.parser, old)
+        result = tracker.update(new)
+        self.assertEqual(result, diff(old, new))
+        self.assertEqual(len(result["added"]["links"]), 1)
+        self.assertIs(tracker.parser, new)
+        result = tracker.update(OlsrParser(links3))
+        self.assertIsNone(result["added"])
+        self.assertIsNone(result["removed"])
+        self.assertIsNone(result["changed"])
+
+    def test_snapshots_indexed_once(self):
+        tracker = TopologyTracker()
+        parsers = [OlsrParser(links2), OlsrParser(links3), OlsrParser(links2)]
+        with mock.patch(
+            "netdiff.tracker._TopologyIndex", wraps=_TopologyIndex
+        ) as index:
+            for parser in parsers:
+                tracker.update(parser)
+        self.assertEqual(index.call_count, 3)
+
+    def test_poll(self):
+        tracker = TopologyTracker(OlsrParser, data=links2)
+        self.assertIsNone(tracker.poll())
+        result = tracker.poll(data=links3)
+        self.assertEqual(len(result["added"]["links"]), 1)
+        self.assertIsNone(result["removed"])
+        self.assertEqual(tracker.kwargs, {"data": links2})
+
+    def test_poll_unchanged_data(self):
+        tracker = TopologyTracker(OlsrParser, data=links2)
+        tracker.poll()
+        parser = tracker.parser
+        with mock.patch.object(OlsrParser, "parse") as parse:
+            with mock.patch("netdiff.tracker._TopologyIndex") as index:
+                result = tracker.poll()
+        parse.assert_not_called()
+        index.assert_not_called()
+        self.assertEqual(result, {"added": None, "removed": None, "changed": None})
+        self.assertIsNot(tracker.parser, parser)
+        self.assertIs(tracker.parser.graph, parser.graph)
+
+    def test_poll_without_parser_class(self):
+        with self.assertRaises(ValueError):
+            TopologyTracker().poll()
+
+    def test_reset(self):
+        tracker = TopologyTracker()
+        tracker.update(OlsrParser(links2))
+        tracker.reset()
+        self.assertIsNone(tracker.parser)
+        self.assertIsNone(tracker.update(OlsrParser(links3)))
+
+
+class TestDiffSeries(TestCase):
+    def _parsers(self):
+        return [OlsrParser(data) for data in [links2, links3, links3, links5, links2]]
+
+    def _expected(self, parsers):
+        return [diff(old, new) for old, new in zip(parsers, parsers[1:])]
+
+    def test_diff_series(self):
+        parsers = self._parsers()
+        with mock.patch(
+            "netdiff.tracker._TopologyIndex", wraps=_TopologyIndex
+        ) as index:
+            results = list(diff_series(iter(parsers)))
+        self.assertEqual(results, self._expected(parsers))
+        # the third snapshot is identical to the second one
+        self.assertEqual(index.call_count, 4)
+
+    def test_diff_series_lazy(self):
+        parsers = self._parsers()
+        results = diff_series(parsers)
+        self.assertEqual(next(results), diff(parsers[0], parsers[1]))
+
+    def test_diff_series_processes(self):
+        parsers = self._parsers()
+        results = list(diff_series(parsers, processes=2))
+        self.assertEqual(results, self._expected(parsers))
+
+    def test_diff_series_short(self):
+        self.assertEqual(list(diff_series([])), [])
+        self.assertEqual(list(diff_series([OlsrParser(links2)], processes=2)), [])
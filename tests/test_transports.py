@@ -0,0 +1,106 @@
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from urllib.parse import quote
+
+from netdiff import NetJsonParser, OlsrParser, register_transport
+from netdiff.exceptions import TopologyRetrievalError
+from netdiff.parsers.base import BaseParser
+from netdiff.transports import exec_transport
+
+CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
+olsr_path = "{0}/static/olsr-2-links.txt".format(CURRENT_DIR)
+netjson_path = "{0}/static/netjson-2-links.json".format(CURRENT_DIR)
+
+
+class TestTransports(unittest.TestCase):
+    def test_unsupported_scheme(self):
+        with self.assertRaises(TopologyRetrievalError):
+            BaseParser(url="gopher://127.0.0.1")
+
+    def test_register_transport(self):
+        streams = []
+
+        def transport(parser, url):
+            self.assertEqual(url.netloc, "router")
+            streams.append(io.BytesIO(open(netjson_path, "rb").read()))
+            return streams[-1]
+
+        register_transport("TEST", transport)
+        try:
+            p = NetJsonParser(url="test://router")
+        finally:
+            register_transport("test", None)
+        self.assertEqual(len(p.graph.edges()), 2)
+        self.assertIsNone(p.checksum)
+        # the stream is closed once parsed
+        self.assertTrue(streams[0].closed)
+        with self.assertRaises(TopologyRetrievalError):
+            NetJsonParser(url="test://router")
+
+    def test_file(self):
+        p = OlsrParser(url="file://" + quote(olsr_path))
+        self.assertEqual(len(p.graph.edges()), 2)
+        p = NetJsonParser(url="file://" + netjson_path)
+        self.assertEqual(len(p.graph.edges()), 2)
+        with self.assertRaises(TopologyRetrievalError):
+            NetJsonParser(url="file:///wrong/path.json")
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not supported")
+    def test_unix(self):
+        received = []
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "olsrd.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(path)
+            server.listen(1)
+
+            def serve():
+                connection, address = server.accept()
+                with connection:
+                    received.append(connection.recv(1024))
+                    connection.sendall(open(olsr_path, "rb").read())
+
+            thread = threading.Thread(target=serve)
+            thread.start()
+            try:
+                p = OlsrParser(url="unix://{0}?/topology".format(path), timeout=5)
+            finally:
+                thread.join()
+                server.close()
+            self.assertEqual(len(p.graph.edges()), 2)
+            self.assertEqual(received, [b"/topology\n"])
+            with self.assertRaises(TopologyRetrievalError):
+                OlsrParser(url="unix://{0}".format(path))
+
+    def test_exec(self):
+        with self.assertRaises(TopologyRetrievalError):
+            NetJsonParser(url="exec://cat " + netjson_path)
+        register_transport("exec", exec_transport)
+        try:
+            command = "{0} -m json.tool {1}".format(sys.executable, netjson_path)
+            p = NetJsonParser(url="exec://" + command)
+            self.assertEqual(len(p.graph.edges()), 2)
+            with self.assertRaises(TopologyRetrievalError):
+                NetJsonParser(url="exec://{0} -c 'exit(3)'".format(sys.executable))
+            with self.assertRaises(TopologyRetrievalError):
+                NetJsonParser(url="exec://wrong-command")
+        finally:
+            register_transport("exec", None)
+
+    def test_exec_timeout(self):
+        register_transport("exec", exec_transport)
+        try:
+            # the command hangs without writing anything
+            command = "{0} -c 'import time; time.sleep(10)'".format(sys.executable)
+            start = time.perf_counter()
+            with self.assertRaises(TopologyRetrievalError):
+                NetJsonParser(url="exec://" + command, timeout=0.5)
+            self.assertLess(time.perf_counter() - start, 5)
+        finally:
+            register_transport("exec", None)
@@ -1,10 +1,29 @@
+import io
 import os
+from unittest import mock
 
-from netdiff import NetJsonParser, diff
+import networkx
+
+from netdiff import (
+    NetJsonParser,
+    OlsrParser,
+    TopologyTracker,
+    apply_diff,
+    compose_diffs,
+    diff,
+    inverse_diff,
+)
 from netdiff.tests import TestCase
+from netdiff.utils import _iter_lines, _iter_string_lines, _read_chunks
 
 CURRENT_DIR = os.path.dirname(os.path.realpath(__file__))
 links2 = open("{0}/static/netjson-2-links.json".format(CURRENT_DIR)).read()
+olsr_links2 = open("{0}/static/olsr-2-links.txt".format(CURRENT_DIR)).read()
+olsr_links2_cost = open(
+    "{0}/static/olsr-2-links-cost-changed.txt".format(CURRENT_DIR)
+).read()
+olsr_links3 = open("{0}/static/olsr-3-links.txt".format(CURRENT_DIR)).read()
+olsr_links5 = open("{0}/static/olsr-5-links.txt".format(CURRENT_DIR)).read()
 
 
 class TestUtils(TestCase):
@@ -84,3 +103,358 @@ class TestUtils(TestCase):
         self.assertIsNotNone(result["removed"])
         self.assertEqual(len(result["removed"]["nodes"]), 0)
         self.assertEqual(len(result["removed"]["links"]), 1)
+
+    def _netjson(self, nodes, links):
+        return {
+            "type": "NetworkGraph",
+            "protocol": "OLSR",
+            "version": "0.6.6",
+            "metric": "ETX",
+            "nodes": [{"id": node} for node in nodes],
+            "links": links,
+        }
+
+    def test_directed_links(self):
+        old = NetJsonParser(
+            self._netjson(
+                ["10.150.0.3", "10.150.0.2"],
+                [
+                    {"source": "10.150.0.3", "target": "10.150.0.2", "cost": 1},
+                    {"source": "10.150.0.2", "target": "10.150.0.3", "cost": 1},
+                ],
+            ),
+            directed=True,
+        )
+        new = NetJsonParser(
+            self._netjson(
+                ["10.150.0.3", "10.150.0.2"],
+                [{"source": "10.150.0.2", "target": "10.150.0.3", "cost": 2}],
+            ),
+            directed=True,
+        )
+        result = diff(old, new)
+        self.assertIsNone(result["added"])
+        self.assertEqual(len(result["removed"]["links"]), 1)
+        link = result["removed"]["links"][0]
+        self.assertEqual(link["source"], "10.150.0.3")
+        self.assertEqual(link["target"], "10.150.0.2")
+        self.assertEqual(len(result["changed"]["links"]), 1)
+        link = result["changed"]["links"][0]
+        self.assertEqual(link["source"], "10.150.0.2")
+        self.assertEqual(link["target"], "10.150.0.3")
+        self.assertEqual(link["cost"], 2)
+
+    def test_unhashable_properties(self):
+        link = {
+            "source": "10.150.0.3",
+            "target": "10.150.0.2",
+            "cost": 1,
+            "properties": {"interfaces": ["eth0", "eth1"]},
+        }
+        old = NetJsonParser(self._netjson(["10.150.0.3", "10.150.0.2"], [link]))
+        new = NetJsonParser(self._netjson(["10.150.0.3", "10.150.0.2"], [link]))
+        self.assertIsNone(diff(old, new)["changed"])
+        link["properties"] = {"interfaces": ["eth0"]}
+        new = NetJsonParser(self._netjson(["10.150.0.3", "10.150.0.2"], [link]))
+        result = diff(old, new)
+        self.assertEqual(len(result["changed"]["links"]), 1)
+        self.assertEqual(
+            result["changed"]["links"][0]["properties"], {"interfaces": ["eth0"]}
+        )
+
+    def test_diff_does_not_copy_graphs(self):
+        old = NetJsonParser(
+            self._netjson(
+                ["10.150.0.3", "10.150.0.2", "10.150.0.5"],
+                [{"source": "10.150.0.3", "target": "10.150.0.5", "cost": 1}],
+            )
+        )
+        new = NetJsonParser(links2)
+        with mock.patch.object(networkx.Graph, "copy") as copy:
+            result = diff(old, new)
+        copy.assert_not_called()
+        self.assertEqual(len(result["added"]["links"]), 2)
+        self.assertEqual(len(result["removed"]["links"]), 1)
+        self.assertEqual(len(result["added"]["nodes"]), 1)
+        self.assertEqual(result["added"]["nodes"][0]["id"], "10.150.0.4")
+        self.assertEqual(len(result["removed"]["nodes"]), 1)
+        self.assertEqual(result["removed"]["nodes"][0]["id"], "10.150.0.5")
+        self.assertEqual(len(old.graph.edges()), 1)
+
+    def test_unchanged_data(self):
+        old = NetJsonParser(links2)
+        new = NetJsonParser(links2)
+        with mock.patch("netdiff.utils._TopologyIndex") as index:
+            result = diff(old, new)
+        index.assert_not_called()
+        self.assertEqual(result, {"added": None, "removed": None, "changed": None})
+        new = NetJsonParser(links2, previous=old)
+        self.assertIs(new.graph, old.graph)
+        with mock.patch("netdiff.utils._TopologyIndex") as index:
+            result = diff(old, new)
+        index.assert_not_called()
+        self.assertEqual(result, {"added": None, "removed": None, "changed": None})
+
+    def test_read_chunks(self):
+        text = "città\nnodo ü\n"
+        chunks = list(_read_chunks(io.BytesIO(text.encode()), size=1))
+        self.assertEqual("".join(chunks), text)
+        chunks = list(_read_chunks(io.StringIO(text), size=4))
+        self.assertEqual(chunks, ["citt", "à\nno", "do ü", "\n"])
+        with self.assertRaises(UnicodeDecodeError):
+            list(_read_chunks(io.BytesIO(text.encode()[:5])))
+
+    def test_iter_lines(self):
+        lines = _iter_lines(["a\nb", "c\n\nd", "", "e"])
+        self.assertEqual(list(lines), ["a", "bc", "", "de"])
+        self.assertEqual(list(_iter_lines(["a\n"])), ["a"])
+
+    def test_iter_string_lines(self):
+        self.assertEqual(list(_iter_string_lines("a\nbc\n\nd")), ["a", "bc", "", "d"])
+        self.assertEqual(list(_iter_string_lines("a\n")), ["a"])
+        self.assertEqual(list(_iter_string_lines("")), [])
+
+
+class TestApplyDiff(TestCase):
+    """tests for apply_diff, inverse_diff and compose_diffs"""
+
+    def _assertSameTopology(self, first, second):
+        """
+        the direction of undirected links may differ
+        """
+
+        def topology(parser):
+            data = parser.json(dict=True)
+            links = {}
+            for link in data.pop("links"):
+                key = frozenset((link.pop("source"), link.pop("target")))
+                links[key] = link
+            return data, links
+
+        self.assertEqual(topology(first), topology(second))
+
+    def test_apply_diff(self):
+        for old_data, new_data in [
+            (olsr_links2, olsr_links5),
+            (olsr_links5, olsr_links2_cost),
+            (olsr_links3, olsr_links2),
+        ]:
+            old = OlsrParser(old_data)
+            new = OlsrParser(new_data)
+            graph = old.graph
+            self.assertIs(apply_diff(old, diff(old, new)), graph)
+            self.assertIs(old.graph, graph)
+            self.assertIsNone(old.checksum)
+            self._assertSameTopology(old, new)
+
+    def test_apply_diff_shared_graph(self):
+        old = OlsrParser(olsr_links5)
+        replica = OlsrParser(olsr_links5, previous=old)
+        self.assertIs(replica.graph, old.graph)
+        graph = old.graph
+        new = OlsrParser(olsr_links2_cost)
+        self.assertIsNot(apply_diff(replica, diff(old, new)), graph)
+        self._assertSameTopology(replica, new)
+        # the parser which shared the graph is not affected
+        self.assertIs(old.graph, graph)
+        self.assertEqual(graph.number_of_edges(), 5)
+        result = diff(old, OlsrParser(olsr_links5))
+        self.assertEqual(result, {"added": None, "removed": None, "changed": None})
+        # the copy is owned by the replica, which is then modified in place
+        graph = replica.graph
+        self.assertIs(apply_diff(replica, diff(new, old)), graph)
+
+    def test_apply_diff_graph(self):
+        old = OlsrParser(olsr_links3)
+        new = OlsrParser(olsr_links5)
+        graph = apply_diff(old.graph, diff(old, new))
+        self.assertIs(graph, old.graph)
+        self.assertEqual(graph.number_of_edges(), 5)
+
+    def test_apply_diff_compact(self):
+        old = OlsrParser(olsr_links5, compact=True)
+        new = OlsrParser(olsr_links2_cost, compact=True)
+        graph = old.graph
+        result = diff(old, new)
+        self.assertIsNot(apply_diff(old, result), graph)
+        self.assertIsNot(old.graph, graph)
+        self._assertSameTopology(old, new)
+        # standalone graphs are not modified
+        self.assertEqual(graph.number_of_edges(), 5)
+        self.assertEqual(apply_diff(graph, result).number_of_edges(), 2)
+
+    def test_apply_diff_metadata(self):
+        old = NetJsonParser(links2)
+        new = OlsrParser(olsr_links5)
+        apply_diff(old, diff(old, new))
+        self.assertEqual(old.protocol, "OLSR")
+        self.assertEqual(old.version, "0.8")
+        self._assertSameTopology(old, new)
+
+    def test_inverse_diff(self):
+        old = OlsrParser(olsr_links5)
+        new = OlsrParser(olsr_links2_cost)
+        result = inverse_diff(diff(old, new), old)
+        expected = diff(new, old)
+        self.assertEqual(result["added"], expected["added"])
+        self.assertIsNone(result["removed"])
+        self.assertEqual(result["changed"]["nodes"], expected["changed"]["nodes"])
+        apply_diff(new, result)
+        self._assertSameTopology(new, old)
+        self.assertEqual(
+            inverse_diff(diff(old, old), old),
+            {"added": None, "removed": None, "changed": None},
+        )
+
+    def test_compose_diffs(self):
+        first = OlsrParser(olsr_links2)
+        second = OlsrParser(olsr_links5)
+        third = OlsrParser(olsr_links2_cost)
+        result = compose_diffs(diff(first, second), diff(second, third))
+        # the nodes and links added and then removed are not included
+        self.assertEqual(result, diff(first, third))
+        self.assertIsNone(result["added"])
+        self.assertIsNone(result["removed"])
+        apply_diff(first, result)
+        self._assertSameTopology(first, third)
+
+    def test_compose_diffs_changed_and_removed(self):
+        first = OlsrParser(olsr_links3)
+        second = OlsrParser(olsr_links3)
+        second.graph.nodes["10.150.0.5"]["label"] = "changed"
+        second.graph["10.150.0.4"]["10.150.0.5"]["weight"] = 2.0
+        second.checksum = None
+        third = OlsrParser(olsr_links2)
+        changes = diff(first, second), diff(second, third)
+        # without the first topology the attributes of the second are reported
+        result = compose_diffs(*changes)
+        self.assertEqual(result["removed"]["nodes"][0]["label"], "changed")
+        self.assertEqual(result["removed"]["links"][0]["cost"], 2.0)
+        result = compose_diffs(*changes, old=first)
+        self.assertEqual(result, diff(first, third))
+        apply_diff(third, inverse_diff(result, first))
+        self._assertSameTopology(third, OlsrParser(olsr_links3))
+
+    def test_compose_diffs_removed_and_added(self):
+        first = OlsrParser(olsr_links5)
+        second = OlsrParser(olsr_links2)
+        result = compose_diffs(diff(first, second), diff(second, first))
+        self.assertIsNone(result["added"])
+        self.assertIsNone(result["removed"])
+        # the previous attributes of changed nodes and links are unknown
+        self.assertEqual(len(result["changed"]["nodes"]), 3)
+        apply_diff(first, result)
+        self._assertSameTopology(first, OlsrParser(olsr_links5))
+
+
+class TestTolerances(TestCase):
+    """tests for the tolerances and ignore arguments of diff"""
+
+    def _parser(self, cost, properties=None, label=None, directed=False):
+        node = {"id": "10.150.0.2"}
+        if label:
+            node["label"] = label
+        return NetJsonParser(
+            {
+                "type": "NetworkGraph",
+                "protocol": "OLSR",
+                "version": "0.6.6",
+                "metric": "ETX",
+                "nodes": [node, {"id": "10.150.0.3"}],
+                "links": [
+                    {
+                        "source": "10.150.0.2",
+                        "target": "10.150.0.3",
+                        "cost": cost,
+                        "properties": properties or {},
+                    }
+                ],
+            },
+            directed=directed,
+        )
+
+    def _changed_links(self, result):
+        if result["changed"] is None:
+            return []
+        return result["changed"]["links"]
+
+    def test_absolute(self):
+        old = self._parser(1.0)
+        self.assertEqual(len(self._changed_links(diff(old, self._parser(1.1)))), 1)
+        self.assertEqual(
+            self._changed_links(diff(old, self._parser(1.1), tolerances={"cost": 0.2})),
+            [],
+        )
+        result = diff(old, self._parser(1.3), tolerances={"weight": 0.2})
+        self.assertEqual(self._changed_links(result)[0]["cost"], 1.3)
+
+    def test_relative(self):
+        old = self._parser(10.0, {"link_quality": 0.5})
+        tolerances = {"cost": {"relative": 0.1}, "link_quality": {"absolute": 0.05}}
+        new = self._parser(10.9, {"link_quality": 0.54})
+        result = diff(old, new, tolerances=tolerances)
+        self.assertEqual(result, {"added": None, "removed": None, "changed": None})
+        new = self._parser(11.5, {"link_quality": 0.5})
+        result = diff(old, new, tolerances=tolerances)
+        self.assertEqual(len(self._changed_links(result)), 1)
+        # other attributes are compared exactly
+        new = self._parser(10.0, {"link_quality": 0.5, "type": "wireless"})
+        result = diff(old, new, tolerances=tolerances)
+        self.assertEqual(len(self._changed_links(result)), 1)
+
+    def test_ignore(self):
+        old = self._parser(1.0, {"bytes_received": 10})
+        new = self._parser(1.0, {"bytes_received": 20}, label="node")
+        result = diff(old, new, ignore=["bytes_received"])
+        self.assertEqual(self._changed_links(result), [])
+        self.assertEqual(len(result["changed"]["nodes"]), 1)
+        new = self._parser(2.0, {"bytes_received": 20})
+        result = diff(old, new, ignore=["bytes_received"])
+        # changed links are reported with all their attributes
+        self.assertEqual(
+            self._changed_links(result)[0]["properties"], {"bytes_received": 20}
+        )
+        result = diff(old, new, ignore=["cost", "bytes_received"])
+        self.assertEqual(self._changed_links(result), [])
+
+    def test_zero_values(self):
+        old = self._parser(0, {"tq": 0})
+        result = diff(old, self._parser(0.5, {"tq": 0}), tolerances={"cost": 1})
+        self.assertEqual(result, {"added": None, "removed": None, "changed": None})
+        result = diff(old, self._parser(2, {"tq": 0}), tolerances={"cost": 1})
+        self.assertEqual(self._changed_links(result)[0]["cost"], 2)
+
+    def test_falsy_values_removed(self):
+        old = self._parser(1.0, {"tq": 0, "flags": [], "name": ""})
+        for properties in [{"flags": [], "name": ""}, {"tq": 0, "name": ""}, {}]:
+            new = self._parser(1.0, properties)
+            result = diff(old, new, tolerances={"cost": 1})
+            self.assertEqual(len(self._changed_links(result)), 1)
+            self.assertEqual(
+                self._changed_links(result), self._changed_links(diff(old, new))
+            )
+
+    def test_invalid_tolerance(self):
+        with self.assertRaises(ValueError):
+            diff(self._parser(1.0), self._parser(2.0), tolerances={"cost": {"abs": 1}})
+
+    def test_tracker_drift(self):
+        tracker = TopologyTracker(tolerances={"cost": 0.15}, ignore=["bytes_received"])
+        tracker.update(self._parser(1.0))
+        reported = []
+        for cost in [1.1, 1.2, 1.3, 1.4]:
+            changed = self._changed_links(tracker.update(self._parser(cost)))
+            reported.append([link["cost"] for link in changed])
+        # the costs are compared with the last reported one
+        self.assertEqual(reported, [[], [1.2], [], [1.4]])
+
+    def test_tracker_drift_directed_and_undirected(self):
+        tracker = TopologyTracker(tolerances={"cost": 0.15})
+        tracker.update(self._parser(1.0))
+        reported = []
+        for cost, directed in [(1.1, True), (1.2, True), (1.3, True), (1.4, False)]:
+            result = tracker.update(self._parser(cost, directed=directed))
+            reported.append([link["cost"] for link in self._changed_links(result)])
+        # the retained costs are kept when the links are compared
+        # ignoring their direction (directed and undirected graphs)
+        self.assertEqual(reported, [[], [1.2], [], [1.4]])
@@ -1,3 +1,4 @@
+import copy
 import os
 
 from freezegun import freeze_time
@@ -87,6 +88,20 @@ class TestWireguardParser(TestCase):
         self.assertEqual(len(graph.nodes), 2)
         self.assertEqual(len(graph.edges), 1)
 
+    def test_parse_does_not_modify_data(self):
+        p = WireguardParser(wg_dump)
+        data = copy.deepcopy(p.original_data)
+        graph = p.parse(p.original_data)
+        self.assertEqual(p.original_data, data)
+        self.assertEqual(len(graph.nodes), 7)
+        self.assertNotIn("peers", graph.nodes["wg0"])
+
+    def test_parse_disconnected(self):
+        with freeze_time("2022-06-06 17:08:39"):
+            p = WireguardParser(wg_dump)
+        peer = p.original_data["wg0"]["peers"][0]
+        self.assertFalse(next(iter(peer.values()))["connected"])
+
     def test_empty_dict(self):
         WireguardParser(data={})
 
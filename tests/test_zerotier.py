@@ -1,3 +1,4 @@
+import copy
 import os
 
 import networkx
@@ -60,6 +61,13 @@ class TestZeroTierParser(TestCase):
         self.assertEqual(list(node1_properties.keys()), self._TEST_PEER_KEYS)
         self.assertEqual(list(node2_properties.keys()), self._TEST_PEER_KEYS)
 
+    def test_parse_does_not_modify_data(self):
+        p = ZeroTierParser(zt_peers)
+        data = copy.deepcopy(p.original_data)
+        graph = p.parse(p.original_data)
+        self.assertEqual(p.original_data, data)
+        self.assertTrue(networkx.utils.graphs_equal(graph, p.graph))
+
     def test_json_dict(self):
         p = ZeroTierParser(zt_peers)
         data = p.json(dict=True)